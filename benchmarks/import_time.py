@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Import-time budget check for the headless code paths
+
+Each module is imported in a fresh interpreter. The check fails when an
+import exceeds its budget or pulls in pygame, torch, gymnasium,
+stable-baselines3 or matplotlib.
+
+Run from the repository root with: python benchmarks/import_time.py
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+# Module -> import-time budget in milliseconds (NumPy alone takes ~100 ms)
+BUDGETS = {
+    "src.core.board": 50,
+    "src.core.player": 50,
+    "src.core.cell_index": 50,
+    "src.game.rules": 50,
+    "src.game.game": 50,
+    "src.ai.encoding": 300,
+    "src.ai.batch_env": 300,
+    "src.ai.mcts": 300,
+    "src.ai.numpy_policy": 300,
+    "src.ai.ai_player": 300,
+}
+
+HEAVY_MODULES = ["pygame", "torch", "gymnasium", "stable_baselines3", "sb3_contrib", "matplotlib"]
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+heavy = [name for name in {heavy!r} if name in sys.modules]
+print(json.dumps({{"ms": elapsed * 1000, "heavy": heavy}}))
+"""
+
+
+def measure(module, repeats):
+    """Median import time of a module in fresh interpreters, and the heavy modules it loaded."""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    times = []
+    heavy = []
+    for _ in range(repeats):
+        result = subprocess.run(
+            [sys.executable, "-c", PROBE.format(module=module, heavy=HEAVY_MODULES)],
+            cwd=root, capture_output=True, text=True, check=True,
+        )
+        data = json.loads(result.stdout.strip().splitlines()[-1])
+        times.append(data["ms"])
+        heavy = data["heavy"]
+    return statistics.median(times), heavy
+
+
+def main():
+    """Measure every module and exit with status 1 if a budget is exceeded."""
+    parser = argparse.ArgumentParser(description="Check import times of the headless modules")
+    parser.add_argument("--repeats", type=int, default=5, help="Fresh interpreters per module")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply every budget (slow machines)")
+    args = parser.parse_args()
+
+    failures = 0
+    for module, budget in BUDGETS.items():
+        ms, heavy = measure(module, args.repeats)
+        limit = budget * args.scale
+        ok = ms <= limit and not heavy
+        failures += not ok
+        note = f"  imports {', '.join(heavy)}" if heavy else ""
+        print(f"{'ok  ' if ok else 'FAIL'} {module:<24} {ms:7.1f} ms (budget {limit:.0f} ms){note}")
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,11 +2,18 @@
 AI player implementations for the hexagonal game
 """
 import random
-import pygame
-from stable_baselines3 import PPO
+import numpy as np
 
 from src.core.player import Player
 from src.core.hexagon import Hexagon
+from src.core.cell_index import CELLS, N_CELLS
+from src.ai.encoding import encode_board, legal_action_mask, legal_actions
+from src.ai.mcts import MCTS, UniformEvaluator
+from src.ai.numpy_policy import load_policy
+
+def decode_move(action):
+    """(source_hex, target_hex) of a flat action index."""
+    return CELLS[action // N_CELLS], CELLS[action % N_CELLS]
 
 class RandomPlayer(Player):
     """
@@ -26,41 +33,38 @@ class RandomPlayer(Player):
         Returns:
             A randomly chosen valid action
         """
-        # Get all pieces of this player's color
-        player_pieces = [
-            pos for pos, piece in board.pieces.items() 
-            if piece.color == self.color and not isinstance(piece, Quadruple)
-        ]
+        move = self.choose_move(board)
+        return move[1] if move is not None else None
+    
+    def choose_move(self, board, progress=None, stop=None):
+        """
+        Choose a random legal move.
         
-        if not player_pieces:
-            return None  # No pieces to move
-            
-        # Try random pieces until we find one with valid moves
-        while player_pieces:
-            # Choose a random piece
-            piece_pos = random.choice(player_pieces)
-            piece = board.pieces[piece_pos]
-            
-            # Get possible moves for this piece
-            moves = piece.possible_moves(board)
-            
-            if moves:
-                # Return a random valid move
-                return random.choice(list(moves))
-            
-            # Remove this piece from consideration if it has no moves
-            player_pieces.remove(piece_pos)
+        Args:
+            board: Game board
+            progress: Unused, for the same interface as the searching players
+            stop: Unused
             
-        return None  # No valid moves found
+        Returns:
+            (source_hex, target_hex), or None if no piece can move
+        """
+        actions = legal_actions(board, self.color)
+        if len(actions) == 0:
+            return None  # No valid moves found
+        return decode_move(int(random.choice(actions)))
 
 class RLPlayer(Player):
     """
     Reinforcement learning AI player using a trained model.
+    
+    The policy is evaluated in NumPy. Pass the .npz written by
+    src.ai.numpy_policy; a MaskablePPO .zip also works but needs
+    stable-baselines3 to convert it on load.
     """
     def __init__(self, color, model_path):
         super().__init__(color=color, name=f"RLAI ({color})")
-        # Load the trained model
-        self.model = PPO.load(model_path)
+        # Load the trained policy
+        self.policy = load_policy(model_path)
         
     def choose_action(self, board, game_state):
         """
@@ -73,11 +77,29 @@ class RLPlayer(Player):
         Returns:
             The selected action based on the model's prediction
         """
+        move = self.choose_move(board)
+        return move[1] if move is not None else None
+    
+    def choose_move(self, board, progress=None, stop=None):
+        """
+        Choose a move using the trained model.
+        
+        Args:
+            board: Game board
+            progress: Unused, for the same interface as the searching players
+            stop: Unused
+            
+        Returns:
+            (source_hex, target_hex), or None if no piece can move
+        """
         # Convert the current board state to the observation format expected by the model
         observation = self._board_to_observation(board)
         
-        # Get action from model
-        action, _states = self.model.predict(observation, deterministic=True)
+        # Get action from model, only legal actions can be chosen
+        mask = legal_action_mask(board, self.color)
+        if not mask.any():
+            return None
+        action = self.policy.predict(observation, action_mask=mask)
         
         # Decode and validate the action
         source_idx, target_idx = self._decode_action(action, board)
@@ -92,24 +114,75 @@ class RLPlayer(Player):
             possible_moves = piece.possible_moves(board)
             
             if target_hex in possible_moves:
-                return target_hex
+                return source_hex, target_hex
         
         # If model gives invalid action, fall back to random valid move
-        return RandomPlayer(self.color).choose_action(board, game_state)
+        return RandomPlayer(self.color).choose_move(board)
     
     def _board_to_observation(self, board):
         """Convert board state to observation format for the model."""
-        # This needs to match the format in environment.py
-        # Implementation details would depend on how we process observations
-        pass
+        # Same encoding as HexGameEnv observations
+        return encode_board(board)
         
     def _decode_action(self, action, board):
         """Convert model action to source and target indices."""
-        n_cells = len(board.complete_hex_board)
-        source_idx = action // n_cells
-        target_idx = action % n_cells
+        source_idx = action // N_CELLS
+        target_idx = action % N_CELLS
         return source_idx, target_idx
     
     def _index_to_hex(self, idx, board):
         """Convert index to hexagon object."""
-        return list(board.complete_hex_board)[idx]
\ No newline at end of file
+        return CELLS[idx]
+
+class MCTSPlayer(Player):
+    """
+    AI player choosing its moves with Monte Carlo Tree Search.
+    
+    The search streams its progress (simulations, nodes, depth, nodes/s and
+    the current best move) to an optional callback and can be stopped early,
+    so a UI can run it in the background.
+    """
+    def __init__(self, color, n_simulations=200, evaluator=None, c_puct=1.0):
+        super().__init__(color=color, name=f"MCTS ({color})")
+        self.n_simulations = n_simulations
+        self.evaluator = evaluator
+        self.c_puct = c_puct
+    
+    def choose_action(self, board, game_state):
+        """Choose an action by tree search (see choose_move)."""
+        move = self.choose_move(board)
+        return move[1] if move is not None else None
+    
+    def choose_move(self, board, progress=None, stop=None):
+        """
+        Search from the current board.
+        
+        Args:
+            board: Game board (left untouched)
+            progress: Optional callable receiving the search stats dict after
+                every round, with the best move so far as "best_move"
+            stop: Optional threading.Event ending the search early
+            
+        Returns:
+            (source_hex, target_hex), or None if no piece can move
+        """
+        # gymnasium is only needed once a search actually runs
+        from src.ai.environment import HexGameEnv
+        
+        env = HexGameEnv()
+        env.set_position(board, 0 if self.color == "red" else 1)
+        if len(env.legal_actions()) == 0:
+            return None
+        
+        evaluator = self.evaluator or UniformEvaluator(env.action_space.n)
+        mcts = MCTS(evaluator, n_simulations=self.n_simulations, c_puct=self.c_puct)
+        
+        def report(stats):
+            best_action = stats["best_action"]
+            progress(dict(stats, best_move=decode_move(best_action) if best_action >= 0 else None))
+        
+        mcts.search(env, progress=report if progress is not None else None, stop=stop)
+        best_action = mcts.tree.best_action()
+        if best_action < 0:
+            return RandomPlayer(self.color).choose_move(board)
+        return decode_move(best_action)
@@ -0,0 +1,168 @@
+"""
+Pure-NumPy batched game simulator
+
+The state of B games is a (B, n_cells) array of cell codes, the same codes as
+the argmax of a HexGameEnv observation (0 = empty, 1-4 = red Unit..Quadruple,
+5-8 = blue Unit..Quadruple, 9 = forbidden). Legal masks of every game are
+computed at once by gathering cell states along precomputed neighbour
+paths and all games advance with
+a single step(actions) call.
+"""
+import numpy as np
+
+from src.ai.encoding import BLUE_START_POSITIONS, RED_START_POSITIONS
+from src.core.board import Board
+from src.core.cell_index import CELL_INDEX, CELLS
+from src.core.hexagon import Hexagon
+
+EMPTY = 0
+FORBIDDEN = 9
+N_CODES = 10
+
+# Piece kinds within a color, code = 1 + kind (red) or 5 + kind (blue)
+UNIT, DOUBLE, TRIPLE, QUADRUPLE = range(4)
+
+
+class BatchedHexGame:
+    """
+    B games of the HexGameEnv rules stepped in lockstep.
+
+    A move copies the source piece onto the target cell (overwriting what was
+    there) and empties the source, like Board.move_piece. An illegal action
+    leaves the game unchanged, gives reward -0.1 and keeps the same player to
+    move; a legal one gives 0.1 and passes the turn. A game ends when a color
+    has no pieces left or the player to move has no legal action.
+
+    Hats are not modelled: HexGameEnv never places them.
+    """
+    def __init__(self, n_games, auto_reset=True):
+        """
+        Args:
+            n_games: Number of games B
+            auto_reset: Reset finished games at the end of step()
+        """
+        board = Board()
+        n_cells = len(CELLS)
+
+        self.n_games = n_games
+        self.n_cells = n_cells
+        self.n_actions = n_cells * n_cells
+        self.auto_reset = auto_reset
+
+        # Neighbour table padded with the sentinel index n_cells, whose own neighbours are the sentinel
+        self.neighbors = np.full((n_cells + 1, 6), n_cells, dtype=np.int64)
+        for i, cell in enumerate(CELLS):
+            for k, neighbor in enumerate(sorted(cell.neighbors(board), key=lambda h: (h.q, h.r))):
+                self.neighbors[i, k] = CELL_INDEX[neighbor]
+        self.forbidden = np.zeros(n_cells, dtype=bool)
+        self.forbidden[[CELL_INDEX[cell] for cell in board.forbidden_cells]] = True
+
+        self.initial_codes = np.zeros(n_cells, dtype=np.int8)
+        self.initial_codes[self.forbidden] = FORBIDDEN
+        for position in RED_START_POSITIONS:
+            self.initial_codes[CELL_INDEX[Hexagon(*position)]] = 1 + UNIT
+        for position in BLUE_START_POSITIONS:
+            self.initial_codes[CELL_INDEX[Hexagon(*position)]] = 5 + UNIT
+
+        self.codes = np.empty((n_games, n_cells), dtype=np.int8)
+        self.current_player = np.empty(n_games, dtype=np.int8)
+        self._mask = None
+        self.reset()
+
+    def reset(self, indices=None):
+        """Put the given games (all by default) back in the starting position."""
+        indices = slice(None) if indices is None else indices
+        self.codes[indices] = self.initial_codes
+        self.current_player[indices] = 0
+        self._mask = None
+
+    def observations(self):
+        """One-hot observations, shape (B, n_cells, 10), as produced by HexGameEnv."""
+        return np.eye(N_CODES, dtype=np.float32)[self.codes]
+
+    def action_mask(self):
+        """Boolean mask (B, n_cells**2) over the flat (source * n_cells + target) actions."""
+        if self._mask is None:
+            self._mask = self._legal_mask()
+        return self._mask
+
+    def _legal_mask(self):
+        n_games, n_cells = self.codes.shape
+        # The sentinel column reads as forbidden, so paths leaving the board never match
+        codes = np.concatenate([self.codes, np.full((n_games, 1), FORBIDDEN, dtype=np.int8)], axis=1)
+        empty = codes == EMPTY
+        red = (codes >= 1) & (codes <= 4)
+        blue = (codes >= 5) & (codes <= 8)
+        kind = np.where(red, codes - 1, codes - 5)
+
+        to_move_red = (self.current_player == 0)[:, np.newaxis]
+        own = np.where(to_move_red, red, blue)
+        enemy = np.where(to_move_red, blue, red)
+        own_fusable = own & ((kind == UNIT) | (kind == DOUBLE))
+
+        mask = np.zeros((n_games, n_cells * n_cells), dtype=bool)
+
+        def mark(games, sources, targets, ok):
+            # ok has shape (pieces, paths...); set every (game, source, target) it selects
+            hit = np.nonzero(ok)
+            mask[games[hit[0]], sources[hit[0]] * n_cells + targets[hit]] = True
+
+        neighbors = self.neighbors
+
+        # Unit: adjacent free cell or allied Unit/Double
+        games, sources = np.nonzero(own[:, :n_cells] & (kind[:, :n_cells] == UNIT))
+        targets = neighbors[sources]
+        mark(games, sources, targets, (empty | own_fusable)[games[:, np.newaxis], targets])
+
+        # Double: first step onto an empty cell, then a free cell, allied Unit/Double or enemy Unit
+        games, sources = np.nonzero(own[:, :n_cells] & (kind[:, :n_cells] == DOUBLE))
+        first = neighbors[sources]
+        targets = neighbors[first]
+        double_ok = empty | own_fusable | (enemy & (kind == UNIT))
+        ok = (empty[games[:, np.newaxis], first][:, :, np.newaxis]
+              & double_ok[games[:, np.newaxis, np.newaxis], targets]
+              & (targets != sources[:, np.newaxis, np.newaxis]))
+        mark(games, sources, targets, ok)
+
+        # Triple: the second ring is not filtered, so the middle step may pass any cell
+        games, sources = np.nonzero(own[:, :n_cells] & (kind[:, :n_cells] == TRIPLE))
+        first = neighbors[sources]
+        targets = neighbors[neighbors[first]]
+        triple_ok = empty | (enemy & (kind == DOUBLE))
+        ok = (empty[games[:, np.newaxis], first][:, :, np.newaxis, np.newaxis]
+              & triple_ok[games[:, np.newaxis, np.newaxis, np.newaxis], targets]
+              & (targets != sources[:, np.newaxis, np.newaxis, np.newaxis]))
+        mark(games, sources, targets, ok)
+
+        return mask
+
+    def step(self, actions):
+        """
+        Play one action in every game.
+
+        Args:
+            actions: (B,) flat action indices
+
+        Returns:
+            (rewards, terminated, valid): float32, bool and bool arrays of shape (B,).
+            With auto_reset, finished games are already back in the starting position.
+        """
+        actions = np.asarray(actions, dtype=np.int64)
+        games = np.arange(self.n_games)
+        valid = self.action_mask()[games, actions]
+
+        moved = games[valid]
+        sources, targets = np.divmod(actions[valid], self.n_cells)
+        self.codes[moved, targets] = self.codes[moved, sources]
+        self.codes[moved, sources] = EMPTY
+        self.current_player[moved] = 1 - self.current_player[moved]
+        self._mask = None
+
+        red_left = ((self.codes >= 1) & (self.codes <= 4)).any(axis=1)
+        blue_left = ((self.codes >= 5) & (self.codes <= 8)).any(axis=1)
+        terminated = ~red_left | ~blue_left | ~self.action_mask().any(axis=1)
+        rewards = np.where(valid, 0.1, -0.1).astype(np.float32)
+
+        if self.auto_reset and terminated.any():
+            self.reset(np.flatnonzero(terminated))
+        return rewards, terminated, valid
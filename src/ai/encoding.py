@@ -0,0 +1,135 @@
+"""
+Board encoding and legal move generation shared by the environment and the AI players
+
+Only depends on src.core and NumPy, so players can use it without gymnasium,
+torch or stable-baselines3 installed.
+"""
+import numpy as np
+
+from src.core.cell_index import CELL_INDEX, N_CELLS
+from src.core.piece import Unit, Double, Triple, Quadruple, Hat
+
+# Starting cells of the simplified placement used by HexGameEnv and the batched simulator
+RED_START_POSITIONS = [(-1, -1, 2), (3, -3, 0), (2, -1, -1), (1, 1, -2)]
+BLUE_START_POSITIONS = [(0, -3, 3), (-1, 2, -1), (-2, 1, 1), (-3, 0, 3)]
+
+# Observation channel of each (piece type, color); empty cells use 0, forbidden cells 9.
+# Hats have no channel (see piece_channel).
+EMPTY_CHANNEL = 0
+FORBIDDEN_CHANNEL = 9
+PIECE_CHANNELS = {
+    (piece_type, color): piece_idx + (0 if color == "red" else 4)
+    for piece_idx, piece_type in enumerate((Unit, Double, Triple, Quadruple), start=1)
+    for color in ("red", "blue")
+}
+
+
+def piece_channel(piece):
+    """Observation channel of the piece on a cell, or None for a lone hat."""
+    # Hats are not encoded: HexGameEnv never places them, so the networks have
+    # never seen one. A hatted piece is stored as (piece, hat) and encoded as
+    # the piece under the hat; a cell holding only a hat reads as the empty
+    # or forbidden cell under it.
+    if isinstance(piece, tuple):
+        piece = piece[0]
+    if isinstance(piece, Hat):
+        return None
+    return PIECE_CHANNELS[type(piece), piece.color]
+
+
+def encode_board(board):
+    """
+    Encode a board as a (n_cells, 10) one-hot observation.
+    
+    For each cell: [is_empty, red Unit..Quadruple, blue Unit..Quadruple, is_forbidden],
+    in the canonical cell order of src.core.cell_index. Hats are left out
+    (see piece_channel), so every row has exactly one channel set.
+    """
+    observation = np.zeros((N_CELLS, 10), dtype=np.float32)
+    observation[:, EMPTY_CHANNEL] = 1  # Empty cells
+    
+    for hex_cell in board.forbidden_cells:
+        idx = CELL_INDEX[hex_cell]
+        observation[idx, EMPTY_CHANNEL] = 0
+        observation[idx, FORBIDDEN_CHANNEL] = 1  # Mark as forbidden
+    
+    for hex_cell, piece in board.pieces.items():
+        channel = piece_channel(piece)
+        if channel is None:
+            continue
+        idx = CELL_INDEX[hex_cell]
+        observation[idx, EMPTY_CHANNEL] = 0
+        observation[idx, channel] = 1
+    
+    return observation
+
+
+# Channel permutation exchanging the red and blue pieces of an observation
+COLOR_SWAP = np.array([0, 5, 6, 7, 8, 1, 2, 3, 4, 9])
+
+
+def mover_observation(observation, player_idx):
+    """
+    Observation from the point of view of the player to move.
+
+    Observations do not say whose turn it is, so the network inputs and the
+    self-play examples swap the colours when blue (player 1) is to move:
+    the mover's pieces are always in the "red" channels, which keeps the
+    values (from the mover's point of view) consistent with the inputs.
+    Works on a single observation or a batch.
+    """
+    return observation[..., COLOR_SWAP] if player_idx else observation
+
+
+def encode_cell(observation, board, hex_cell):
+    """Re-encode a single cell of an observation in place after a move."""
+    row = observation[CELL_INDEX[hex_cell]]
+    row[:] = 0
+    piece = board.pieces.get(hex_cell)
+    channel = piece_channel(piece) if piece is not None else None
+    if hex_cell in board.forbidden_cells:
+        row[FORBIDDEN_CHANNEL] = 1
+    elif channel is not None:
+        row[channel] = 1
+    else:
+        row[EMPTY_CHANNEL] = 1
+
+
+def legal_targets(board, piece):
+    """Destinations of a piece that the board will actually accept."""
+    if not piece.can_move():
+        return set()
+    return {
+        target_hex for target_hex in piece.possible_moves(board)
+        if target_hex not in board.forbidden_cells
+    }
+
+
+def legal_actions(board, color):
+    """
+    Legal move generator shared by the environment and the AI players.
+    
+    Args:
+        board: Game board
+        color: Color of the player to move
+        
+    Returns:
+        Sorted int64 array of flat action indices (source_idx * n_cells + target_idx)
+    """
+    actions = []
+    for source_hex, piece in list(board.pieces.items()):
+        # Pieces under a hat are immobilized
+        if isinstance(piece, tuple) or piece.color != color:
+            continue
+        source_idx = CELL_INDEX[source_hex]
+        for target_hex in legal_targets(board, piece):
+            actions.append(source_idx * N_CELLS + CELL_INDEX[target_hex])
+    
+    return np.array(sorted(actions), dtype=np.int64)
+
+
+def legal_action_mask(board, color):
+    """Boolean mask over the flat action space, True for legal actions."""
+    mask = np.zeros(N_CELLS * N_CELLS, dtype=bool)
+    mask[legal_actions(board, color)] = True
+    return mask
@@ -1,13 +1,19 @@
 """
 Gym environment for reinforcement learning
 """
+import copy
 import gymnasium as gym
 import numpy as np
 from gymnasium import spaces
 
+from src.ai.encoding import (
+    BLUE_START_POSITIONS, RED_START_POSITIONS, encode_board, encode_cell, legal_actions, legal_targets
+)
 from src.core.board import Board
+from src.core.cell_index import CELLS, N_CELLS
+from src.core.hexagon import Hexagon
 from src.core.player import Player
-from src.core.piece import Unit, Double, Triple, Quadruple, Hat
+from src.core.piece import Unit
 
 class HexGameEnv(gym.Env):
     """
@@ -30,12 +36,14 @@ class HexGameEnv(gym.Env):
         # Action space: move piece from source to destination
         # Each location on board can be represented by its q,r,s coordinates
         # We simplify by using flattened indices of valid board positions
-        n_cells = len(self.board.complete_hex_board)
+        # Cells are numbered in the canonical order of src.core.cell_index
+        n_cells = N_CELLS
         self.action_space = spaces.Discrete(n_cells * n_cells)  # source_cell * target_cell
         
         # Observation space: state of the board
-        # For each cell: [is_empty, is_red_unit, is_red_double, ..., is_blue_hat]
-        # 10 possible states per cell (empty, 4 red piece types, 4 blue piece types, forbidden)
+        # For each cell: [is_empty, is_red_unit, ..., is_blue_quadruple, is_forbidden]
+        # 10 possible states per cell (empty, 4 red piece types, 4 blue piece types, forbidden);
+        # hats are not encoded (see encoding.piece_channel)
         self.observation_space = spaces.Box(low=0, high=1, 
                                            shape=(n_cells, 10), 
                                            dtype=np.float32)
@@ -56,10 +64,14 @@ class HexGameEnv(gym.Env):
         
         # Reset players and turn
         self.current_player_idx = 0
+        self._legal_actions = None
+        
+        # Encode the whole board once; steps only patch the cells they touch
+        self._observation = encode_board(self.board)
         
         # Get initial observation
         observation = self._get_observation()
-        info = {}
+        info = {"action_mask": self.action_mask()}
         
         return observation, info
         
@@ -87,13 +99,11 @@ class HexGameEnv(gym.Env):
         valid_move = False
         reward = -0.1  # Small penalty for invalid moves
         
-        if (source_hex in self.board.pieces and 
-            self.board.pieces[source_hex].color == current_player.color):
-            
-            piece = self.board.pieces[source_hex]
-            possible_moves = piece.possible_moves(self.board)
+        piece = self.board.pieces.get(source_hex)
+        if (piece is not None and not isinstance(piece, tuple) and
+            piece.color == current_player.color):
             
-            if target_hex in possible_moves:
+            if target_hex in self._legal_targets(piece):
                 # Execute the move
                 current_player.move_piece(source_hex, target_hex, self.board)
                 valid_move = True
@@ -106,6 +116,9 @@ class HexGameEnv(gym.Env):
         # Switch players if valid move
         if valid_move:
             self.current_player_idx = 1 - self.current_player_idx
+            self._legal_actions = None
+            encode_cell(self._observation, self.board, source_hex)
+            encode_cell(self._observation, self.board, target_hex)
         
         # Get updated observation
         observation = self._get_observation()
@@ -117,7 +130,8 @@ class HexGameEnv(gym.Env):
         # Prepare info dict
         info = {
             "valid_move": valid_move,
-            "current_player": self.current_player_idx
+            "current_player": self.current_player_idx,
+            "action_mask": self.action_mask()
         }
         
         return observation, reward, terminated, truncated, info
@@ -135,68 +149,63 @@ class HexGameEnv(gym.Env):
         """Set up initial piece positions for the game."""
         # This is a simplified example - actual setup could vary
         # Place red units (Player 1)
-        red_positions = [
-            (-1, -1, 2), (3, -3, 0), (2, -1, -1), (1, 1, -2)
-        ]
-        for pos in red_positions:
-            self.board.place_piece(Unit("red", pos), pos)
+        for pos in RED_START_POSITIONS:
+            self.board.place_piece(Unit("red", Hexagon(*pos)), Hexagon(*pos))
 
         # Place blue units (Player 2)
-        blue_positions = [
-            (0, -3, 3), (-1, 2, -1), (-2, 1, 1), (-3, 0, 3)
-        ]
-        for pos in blue_positions:
-            self.board.place_piece(Unit("blue", pos), pos)
+        for pos in BLUE_START_POSITIONS:
+            self.board.place_piece(Unit("blue", Hexagon(*pos)), Hexagon(*pos))
     
     def _get_observation(self):
-        """Convert the current board state to an observation."""
-        n_cells = len(self.board.complete_hex_board)
-        observation = np.zeros((n_cells, 10), dtype=np.float32)
-        
-        # Map each cell to its index
-        cell_to_idx = {hex_cell: idx for idx, hex_cell in enumerate(self.board.complete_hex_board)}
-        
-        # Fill the observation matrix
-        for hex_cell, idx in cell_to_idx.items():
-            if hex_cell in self.board.forbidden_cells:
-                observation[idx, 9] = 1  # Mark as forbidden
-            elif hex_cell in self.board.pieces:
-                piece = self.board.pieces[hex_cell]
-                piece_idx = 0
-                
-                # Determine piece type index
-                if isinstance(piece, Unit):
-                    piece_idx = 1
-                elif isinstance(piece, Double):
-                    piece_idx = 2
-                elif isinstance(piece, Triple):
-                    piece_idx = 3
-                elif isinstance(piece, Quadruple):
-                    piece_idx = 4
-                elif isinstance(piece, Hat):
-                    piece_idx = 5
-                
-                # Adjust index for color
-                if piece.color == "red":
-                    observation[idx, piece_idx] = 1
-                else:  # blue
-                    observation[idx, piece_idx + 4] = 1
-            else:
-                observation[idx, 0] = 1  # Empty cell
-                
-        return observation
+        """Return a copy of the current observation."""
+        return self._observation.copy()
+    
+    def legal_actions(self):
+        """
+        List every legal action for the player to move.
+        
+        Returns:
+            Sorted int64 array of flat action indices (source_idx * n_cells + target_idx)
+        """
+        # Cached until the position changes
+        if self._legal_actions is None:
+            color = self.players[self.current_player_idx].color
+            self._legal_actions = legal_actions(self.board, color)
+        return self._legal_actions
+    
+    def action_mask(self):
+        """Boolean mask over the action space, True for legal actions."""
+        mask = np.zeros(self.action_space.n, dtype=bool)
+        mask[self.legal_actions()] = True
+        return mask
+    
+    def action_masks(self):
+        """Alias used by sb3-contrib's MaskablePPO."""
+        return self.action_mask()
+    
+    def set_position(self, board, current_player_idx):
+        """Continue from a copy of an existing board, with the given player to move."""
+        self.board = copy.deepcopy(board)
+        self.current_player_idx = current_player_idx
+        self._legal_actions = None
+        self._observation = encode_board(self.board)
+    
+    def copy(self):
+        """Return an independent copy of the environment (used by tree search)."""
+        return copy.deepcopy(self)
+    
+    def _legal_targets(self, piece):
+        return legal_targets(self.board, piece)
     
     def _decode_action(self, action):
         """Convert flat action index to source and target indices."""
-        n_cells = len(self.board.complete_hex_board)
-        source_idx = action // n_cells
-        target_idx = action % n_cells
+        source_idx = action // N_CELLS
+        target_idx = action % N_CELLS
         return source_idx, target_idx
     
     def _index_to_hex(self, idx):
         """Convert index to hexagon object."""
-        # Convert the flat index back to a hexagon
-        return list(self.board.complete_hex_board)[idx]
+        return CELLS[idx]
     
     def _check_game_over(self):
         """Check if the game is over."""
@@ -205,4 +214,7 @@ class HexGameEnv(gym.Env):
         red_pieces = sum(1 for piece in self.board.pieces.values() if piece.color == "red")
         blue_pieces = sum(1 for piece in self.board.pieces.values() if piece.color == "blue")
         
-        return red_pieces == 0 or blue_pieces == 0
\ No newline at end of file
+        # A player left without a legal move (e.g. only Quadruples) loses: an
+        # all-False action mask could not be sampled from
+        return red_pieces == 0 or blue_pieces == 0 or len(self.legal_actions()) == 0
+
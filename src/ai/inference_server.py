@@ -0,0 +1,312 @@
+"""
+Batched inference server - one process owns the network and serves every self-play worker
+"""
+import multiprocessing as mp
+import os
+import queue
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+
+class InferenceServer:
+    """
+    Local inference server shared by many worker processes.
+
+    Each worker gets a fixed slot in the shared-memory arrays (observations,
+    policy logits, values, sequence number). A worker writes its leaves into
+    its slot and posts (worker_id, count, sequence) on the request queue; the
+    server gathers requests until max_batch_size leaves are waiting or
+    max_latency seconds have passed since the first one, runs a single forward
+    pass, writes the results and the request's sequence number back into the
+    slots and wakes the workers up. Only these small control messages go
+    through queues, never the arrays themselves. A client ignores answers
+    whose sequence number is not the one it is waiting for: late answers to
+    a worker that timed out or died in the same slot.
+
+    The checkpoint file is polled every reload_interval seconds and reloaded
+    in place when it changes, so workers pick up new weights without restarting.
+    Each reload increments a shared weights generation, which clients expose
+    so caches of network outputs know when to drop their entries.
+    """
+    def __init__(self, checkpoint_path, n_workers, observation_shape, n_actions,
+                 slot_size=32, max_batch_size=256, max_latency=0.002,
+                 reload_interval=5.0, response_timeout=60.0, device="cpu", mp_context=None):
+        """
+        Args:
+            checkpoint_path: Checkpoint written by network.save_checkpoint
+            n_workers: Number of client slots
+            observation_shape: Shape of one observation, e.g. (n_cells, 10)
+            n_actions: Size of the policy output
+            slot_size: Maximum number of observations per request (the MCTS batch size)
+            max_batch_size: Number of observations that triggers a forward pass immediately
+            max_latency: Longest time (seconds) a request waits for others to batch with
+            reload_interval: Seconds between checks of the checkpoint modification time
+            response_timeout: Seconds a client waits for an answer before giving up
+            device: Torch device used by the server process
+            mp_context: multiprocessing context (defaults to the platform default)
+        """
+        self.checkpoint_path = checkpoint_path
+        self.n_workers = n_workers
+        self.observation_shape = tuple(observation_shape)
+        self.n_actions = n_actions
+        self.slot_size = slot_size
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency
+        self.reload_interval = reload_interval
+        self.response_timeout = response_timeout
+        self.device = device
+        self.ctx = mp_context or mp.get_context()
+
+        self._blocks = {}
+        self._process = None
+        self.requests = None
+        self.ready = None
+        self.generation = None
+
+    def _shapes(self):
+        return {
+            "observations": ((self.n_workers, self.slot_size) + self.observation_shape, np.float32),
+            "policy_logits": ((self.n_workers, self.slot_size, self.n_actions), np.float32),
+            "values": ((self.n_workers, self.slot_size), np.float32),
+            "sequences": ((self.n_workers,), np.int64),
+        }
+
+    def start(self):
+        """Allocate the shared buffers and launch the server process."""
+        for name, (shape, dtype) in self._shapes().items():
+            nbytes = int(np.prod(shape)) * np.dtype(dtype).itemsize
+            self._blocks[name] = shared_memory.SharedMemory(create=True, size=nbytes)
+
+        self.requests = self.ctx.Queue()
+        self.ready = [self.ctx.Semaphore(0) for _ in range(self.n_workers)]
+        self.generation = self.ctx.Value("i", 0)
+
+        self._process = self.ctx.Process(
+            target=_serve,
+            args=(self._layout(), self.requests, self.ready, self.generation, self.checkpoint_path,
+                  self.max_batch_size, self.max_latency, self.reload_interval, self.device),
+            name="inference-server",
+            daemon=True,
+        )
+        self._process.start()
+        return self
+
+    def _layout(self):
+        """Names, shapes and dtypes needed to attach to the shared buffers."""
+        return {
+            name: (self._blocks[name].name, shape, np.dtype(dtype).str)
+            for name, (shape, dtype) in self._shapes().items()
+        }
+
+    def client(self, worker_id):
+        """
+        Build the evaluator a worker process uses to query the server.
+        It must be handed to the worker when the process is created.
+        """
+        return InferenceClient(worker_id, self._layout(), self.requests, self.ready[worker_id],
+                               self.slot_size, self.response_timeout, self.generation)
+
+    def is_alive(self):
+        return self._process is not None and self._process.is_alive()
+
+    def stop(self, timeout=5.0):
+        """Shut the server down and release the shared buffers."""
+        if self._process is not None:
+            self.requests.put(None)
+            self._process.join(timeout)
+            if self._process.is_alive():
+                self._process.terminate()
+            self._process = None
+
+        for block in self._blocks.values():
+            block.close()
+            block.unlink()
+        self._blocks = {}
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+
+class InferenceClient:
+    """
+    MCTS evaluator that forwards observations to an InferenceServer.
+
+    Usable anywhere a NetworkEvaluator is: calling it with a batch of
+    observations returns (policy_logits, values).
+    """
+    def __init__(self, worker_id, layout, requests, ready, slot_size, response_timeout=60.0, generation=None):
+        self.worker_id = worker_id
+        self.layout = layout
+        self.requests = requests
+        self.ready = ready
+        self.slot_size = slot_size
+        self.response_timeout = response_timeout
+        self._generation = generation
+        self._arrays = None
+        self._blocks = None
+        self._sequence = 0
+
+    @property
+    def generation(self):
+        """Weights generation of the server, incremented on every reload."""
+        return self._generation.value if self._generation is not None else 0
+
+    def _attach(self):
+        self._blocks, self._arrays = _attach(self.layout)
+        # Drop any answer addressed to a previous worker that died in this slot
+        while self.ready.acquire(False):
+            pass
+        # The monotonic clock is shared by all processes and advances faster than
+        # requests are made, so this client's sequence numbers never repeat those
+        # of a previous worker in the slot
+        self._sequence = time.monotonic_ns()
+
+    def _wait(self, sequence):
+        """Wait for the answer to request sequence, skipping late answers to older ones."""
+        deadline = time.monotonic() + self.response_timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not self.ready.acquire(timeout=remaining):
+                raise RuntimeError(f"Inference server did not answer within {self.response_timeout} seconds")
+            if self._arrays["sequences"][self.worker_id] == sequence:
+                return
+
+    def __call__(self, observations):
+        if self._arrays is None:
+            self._attach()
+
+        observations = np.asarray(observations, dtype=np.float32)
+        slot_obs = self._arrays["observations"][self.worker_id]
+        slot_logits = self._arrays["policy_logits"][self.worker_id]
+        slot_values = self._arrays["values"][self.worker_id]
+
+        policy_logits = np.empty((len(observations), slot_logits.shape[-1]), dtype=np.float32)
+        values = np.empty(len(observations), dtype=np.float32)
+
+        # Requests larger than the slot are sent in several chunks
+        for start in range(0, len(observations), self.slot_size):
+            chunk = observations[start:start + self.slot_size]
+            count = len(chunk)
+            slot_obs[:count] = chunk
+            self._sequence += 1
+            self.requests.put((self.worker_id, count, self._sequence))
+            self._wait(self._sequence)
+            policy_logits[start:start + count] = slot_logits[:count]
+            values[start:start + count] = slot_values[:count]
+
+        return policy_logits, values
+
+    def close(self):
+        if self._blocks is not None:
+            self._arrays = None
+            for block in self._blocks.values():
+                block.close()
+            self._blocks = None
+
+    def __getstate__(self):
+        # Shared-memory handles are reattached lazily in the receiving process
+        state = self.__dict__.copy()
+        state["_arrays"] = None
+        state["_blocks"] = None
+        return state
+
+
+def _attach(layout):
+    """Map the shared buffers described by a layout as NumPy arrays."""
+    blocks = {}
+    arrays = {}
+    for name, (shm_name, shape, dtype) in layout.items():
+        blocks[name] = shared_memory.SharedMemory(name=shm_name)
+        arrays[name] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=blocks[name].buf)
+    return blocks, arrays
+
+
+def _checkpoint_mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def _serve(layout, requests, ready, generation, checkpoint_path, max_batch_size, max_latency, reload_interval, device):
+    """Server process main loop."""
+    from src.ai.network import NetworkEvaluator, load_checkpoint
+
+    blocks, arrays = _attach(layout)
+    observations = arrays["observations"]
+    policy_logits = arrays["policy_logits"]
+    values = arrays["values"]
+    sequences = arrays["sequences"]
+
+    evaluator = NetworkEvaluator(load_checkpoint(checkpoint_path, device), device=device)
+    loaded_mtime = _checkpoint_mtime(checkpoint_path)
+    next_reload_check = time.monotonic() + reload_interval
+
+    try:
+        while True:
+            # Hot reload: swap the weights in place, workers never notice
+            now = time.monotonic()
+            if now >= next_reload_check:
+                next_reload_check = now + reload_interval
+                mtime = _checkpoint_mtime(checkpoint_path)
+                if mtime is not None and mtime != loaded_mtime:
+                    try:
+                        network = load_checkpoint(checkpoint_path, device)
+                    except Exception as error:
+                        print(f"Inference server: could not reload {checkpoint_path}: {error}")
+                    else:
+                        evaluator = NetworkEvaluator(network, device=device)
+                        loaded_mtime = mtime
+                        with generation.get_lock():
+                            generation.value += 1
+                        print(f"Inference server: reloaded {checkpoint_path}")
+
+            try:
+                request = requests.get(timeout=reload_interval)
+            except queue.Empty:
+                continue
+            if request is None:
+                break
+
+            # Dynamic batching: wait for more requests until the batch is full or the deadline passes
+            batch = [request]
+            total = request[1]
+            deadline = time.monotonic() + max_latency
+            stopping = False
+            while total < max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    request = requests.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if request is None:
+                    stopping = True
+                    break
+                batch.append(request)
+                total += request[1]
+
+            stacked = np.concatenate([observations[worker_id, :count] for worker_id, count, _sequence in batch])
+            batch_logits, batch_values = evaluator(stacked)
+
+            offset = 0
+            for worker_id, count, sequence in batch:
+                policy_logits[worker_id, :count] = batch_logits[offset:offset + count]
+                values[worker_id, :count] = batch_values[offset:offset + count]
+                # Written last: the client only accepts results carrying its request number
+                sequences[worker_id] = sequence
+                offset += count
+                ready[worker_id].release()
+
+            if stopping:
+                break
+    finally:
+        del observations, policy_logits, values, sequences, arrays
+        for block in blocks.values():
+            block.close()
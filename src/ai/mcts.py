@@ -0,0 +1,344 @@
+"""
+Monte Carlo Tree Search with array-backed node storage
+"""
+import math
+import time
+
+import numpy as np
+
+from src.ai.encoding import mover_observation
+
+# Policies applied when the node pool reaches max_nodes
+ON_FULL_POLICIES = ("raise", "freeze", "stop")
+
+
+class MCTSTree:
+    """
+    Search tree whose statistics live in preallocated NumPy arrays.
+
+    Every node is an integer index. The children of a node are allocated as one
+    contiguous block [first_child, first_child + child_count), so a node never
+    stores a dict or a parent pointer and UCB selection is a slice operation.
+    Index 0 is always the root.
+    """
+    def __init__(self, initial_capacity=4096, max_nodes=1000000, on_full="freeze"):
+        """
+        Args:
+            initial_capacity: Number of nodes allocated up front
+            max_nodes: Hard cap on the node pool; arrays grow by doubling up to it
+            on_full: What to do when an expansion does not fit in the pool:
+                "raise" raises MemoryError, "freeze" keeps searching without
+                growing the tree, "stop" ends the current search early
+        """
+        if on_full not in ON_FULL_POLICIES:
+            raise ValueError(f"on_full must be one of {ON_FULL_POLICIES}, got {on_full!r}")
+
+        self.max_nodes = max_nodes
+        self.on_full = on_full
+        capacity = max(1, min(initial_capacity, max_nodes))
+
+        self.N = np.zeros(capacity, dtype=np.int32)            # Visit counts
+        self.W = np.zeros(capacity, dtype=np.float32)          # Sum of backed-up values
+        self.P = np.zeros(capacity, dtype=np.float32)          # Prior probabilities
+        self.first_child = np.full(capacity, -1, dtype=np.int32)
+        self.child_count = np.zeros(capacity, dtype=np.int32)
+        self.action = np.full(capacity, -1, dtype=np.int32)    # Action leading to the node
+
+        self.size = 1  # The root
+
+    @property
+    def capacity(self):
+        return len(self.N)
+
+    def reset(self):
+        """Discard every node except a fresh root, keeping the allocated arrays."""
+        used = self.size
+        self.N[:used] = 0
+        self.W[:used] = 0.0
+        self.P[:used] = 0.0
+        self.first_child[:used] = -1
+        self.child_count[:used] = 0
+        self.action[:used] = -1
+        self.size = 1
+
+    def is_expanded(self, node):
+        return self.child_count[node] > 0
+
+    def _reserve(self, count):
+        """
+        Make room for `count` more nodes.
+
+        Returns:
+            True if the nodes fit, False if the pool is full (or raises, per policy)
+        """
+        needed = self.size + count
+        if needed <= self.capacity:
+            return True
+
+        if needed > self.max_nodes:
+            if self.on_full == "raise":
+                raise MemoryError(
+                    f"MCTS node pool exhausted ({self.size} used, {count} requested, max {self.max_nodes})"
+                )
+            return False
+
+        new_capacity = min(self.max_nodes, max(needed, 2 * self.capacity))
+        for name in ("N", "W", "P", "first_child", "child_count", "action"):
+            old = getattr(self, name)
+            fill = -1 if name in ("first_child", "action") else 0
+            new = np.full(new_capacity, fill, dtype=old.dtype)
+            new[:self.size] = old[:self.size]
+            setattr(self, name, new)
+        return True
+
+    def expand(self, node, actions, priors):
+        """
+        Allocate one child per legal action.
+
+        Args:
+            node: Index of the leaf being expanded
+            actions: Array of legal action indices
+            priors: Prior probability of each action (same order as actions)
+
+        Returns:
+            True if the children were allocated, False if the pool is full
+        """
+        count = len(actions)
+        if count == 0 or not self._reserve(count):
+            return False
+
+        start = self.size
+        end = start + count
+        self.action[start:end] = actions
+        self.P[start:end] = priors
+        self.first_child[node] = start
+        self.child_count[node] = count
+        self.size = end
+        return True
+
+    def children(self, node):
+        """Return the slice of child indices of a node."""
+        start = self.first_child[node]
+        return np.arange(start, start + self.child_count[node])
+
+    def select_child(self, node, c_puct):
+        """Pick the child maximising the PUCT score, evaluated on the whole block at once."""
+        start = self.first_child[node]
+        end = start + self.child_count[node]
+
+        visits = self.N[start:end]
+        q = self.W[start:end] / np.maximum(visits, 1)
+        u = c_puct * self.P[start:end] * math.sqrt(self.N[node]) / (1 + visits)
+        return start + int(np.argmax(q + u))
+
+    def apply_virtual_loss(self, path, virtual_loss):
+        """Make a path look visited and lost so concurrent descents spread out."""
+        path = np.asarray(path, dtype=np.int64)
+        self.N[path] += virtual_loss
+        self.W[path] -= virtual_loss
+
+    def revert_virtual_loss(self, path, virtual_loss):
+        path = np.asarray(path, dtype=np.int64)
+        self.N[path] -= virtual_loss
+        self.W[path] += virtual_loss
+
+    def backup(self, path, value):
+        """
+        Propagate a leaf value up the search path.
+
+        Args:
+            path: Node indices from the root to the leaf
+            value: Leaf value from the point of view of the player to move at the leaf
+        """
+        path = np.asarray(path, dtype=np.int64)
+        # W[node] is stored from the point of view of the player who moved into node,
+        # so the sign flips at every ply starting with the leaf itself
+        signs = np.where(np.arange(len(path))[::-1] % 2 == 0, -1.0, 1.0).astype(np.float32)
+        self.N[path] += 1
+        self.W[path] += signs * value
+
+    def best_action(self, node=0):
+        """Action of the most visited child of a node, or -1 if it has none."""
+        if not self.is_expanded(node):
+            return -1
+        start = self.first_child[node]
+        visits = self.N[start:start + self.child_count[node]]
+        return int(self.action[start + int(np.argmax(visits))])
+
+    def visit_distribution(self, action_size, node=0):
+        """Return the normalised visit counts of a node's children over the full action space."""
+        pi = np.zeros(action_size, dtype=np.float32)
+        children = self.children(node)
+        if len(children) == 0:
+            return pi
+
+        visits = self.N[children].astype(np.float32)
+        total = visits.sum()
+        if total > 0:
+            pi[self.action[children]] = visits / total
+        else:
+            pi[self.action[children]] = 1.0 / len(children)
+        return pi
+
+
+class UniformEvaluator:
+    """Evaluator returning flat priors and a zero value, for search without a network."""
+    def __init__(self, action_size):
+        self.action_size = action_size
+
+    def __call__(self, observations):
+        batch = len(observations)
+        return np.zeros((batch, self.action_size), dtype=np.float32), np.zeros(batch, dtype=np.float32)
+
+
+class MCTS:
+    """
+    PUCT search over a HexGameEnv with batched leaf evaluation.
+
+    Nodes do not hold environment copies: each simulation copies the root
+    environment once and replays the actions along the selected path.
+    Each round descends up to batch_size times, using virtual loss to steer
+    the descents towards different leaves, then evaluates all the collected
+    leaves with a single evaluator call and backs every result up.
+    The evaluator maps a batch of observations, seen from the player to move
+    (see encoding.mover_observation), to (policy_logits, values), with logits
+    over the full action space and values from the point of view of that player.
+    """
+    def __init__(self, evaluator, n_simulations=100, c_puct=1.0, batch_size=8, virtual_loss=1,
+                 initial_capacity=4096, max_nodes=1000000, on_full="freeze"):
+        self.evaluator = evaluator
+        self.n_simulations = n_simulations
+        self.c_puct = c_puct
+        self.batch_size = batch_size
+        self.virtual_loss = virtual_loss
+        self.tree = MCTSTree(initial_capacity=initial_capacity, max_nodes=max_nodes, on_full=on_full)
+
+    def search(self, env, progress=None, stop=None):
+        """
+        Run the configured number of simulations from the current state of env.
+
+        Args:
+            env: HexGameEnv positioned at the root state (left untouched)
+            progress: Optional callable receiving a stats dict after every round
+                (simulations, nodes, depth, nodes_per_sec, best_action)
+            stop: Optional threading.Event; the search ends early once it is set
+
+        Returns:
+            Visit distribution over the full action space
+        """
+        tree = self.tree
+        tree.reset()
+
+        start_time = time.perf_counter()
+        max_depth = 0
+        simulations = 0
+        stopped = False
+        while simulations < self.n_simulations and not stopped:
+            if stop is not None and stop.is_set():
+                break
+            pending, terminal = self._collect_leaves(env, min(self.batch_size, self.n_simulations - simulations))
+
+            # EVALUATION: one forward pass for every pending leaf of the round
+            if pending:
+                observations = np.stack([
+                    mover_observation(observation, sim_env.current_player_idx)
+                    for _path, sim_env, observation in pending
+                ])
+                policy_logits, values = self.evaluator(observations)
+
+                for i, (path, sim_env, _observation) in enumerate(pending):
+                    if not self._expand(path[-1], sim_env, policy_logits[i]):
+                        stopped = True
+                    tree.revert_virtual_loss(path, self.virtual_loss)
+                    tree.backup(path, float(values[i]))
+
+            # The player who just moved won, and it is now the loser's turn
+            for path in terminal:
+                tree.revert_virtual_loss(path, self.virtual_loss)
+                tree.backup(path, -1.0)
+
+            simulations += len(pending) + len(terminal)
+
+            if progress is not None:
+                paths = [path for path, _sim_env, _observation in pending] + terminal
+                max_depth = max([max_depth] + [len(path) - 1 for path in paths])
+                elapsed = time.perf_counter() - start_time
+                progress({
+                    "simulations": simulations,
+                    "nodes": tree.size,
+                    "depth": max_depth,  # Deepest path from the root so far
+                    "nodes_per_sec": tree.size / elapsed if elapsed > 0 else 0.0,
+                    "best_action": tree.best_action(),
+                })
+
+        return tree.visit_distribution(env.action_space.n)
+
+    def _collect_leaves(self, env, batch_size):
+        """
+        Descend up to batch_size times under virtual loss.
+
+        Returns:
+            (pending, terminal): leaves to evaluate as (path, sim_env, observation)
+            tuples, and paths that ended on a finished game
+        """
+        tree = self.tree
+        pending = []
+        terminal = []
+        pending_leaves = set()
+
+        for _ in range(batch_size):
+            sim_env = env.copy()
+            node = 0
+            path = [node]
+            terminated = False
+            observation = None
+
+            # SELECTION
+            while tree.is_expanded(node):
+                node = tree.select_child(node, self.c_puct)
+                observation, _reward, terminated, _truncated, _info = sim_env.step(int(tree.action[node]))
+                path.append(node)
+                if terminated:
+                    break
+
+            if terminated:
+                tree.apply_virtual_loss(path, self.virtual_loss)
+                terminal.append(path)
+                continue
+
+            # A second descent reaching a pending leaf means the tree has no
+            # other leaf worth visiting yet: evaluate what we have
+            if node in pending_leaves:
+                break
+
+            if observation is None:
+                observation = sim_env._get_observation()
+            tree.apply_virtual_loss(path, self.virtual_loss)
+            pending.append((path, sim_env, observation))
+            pending_leaves.add(node)
+
+        return pending, terminal
+
+    def _expand(self, node, sim_env, policy_logits):
+        """
+        Allocate the children of an evaluated leaf.
+
+        Returns:
+            False if the search must stop because the node pool is full
+        """
+        legal = sim_env.legal_actions()
+        if len(legal) == 0:
+            return True
+
+        priors = _masked_softmax(policy_logits, legal)
+        if not self.tree.expand(node, legal, priors):
+            return self.tree.on_full != "stop"
+        return True
+
+
+def _masked_softmax(logits, legal):
+    """Softmax of the logits restricted to the legal actions."""
+    legal_logits = np.asarray(logits, dtype=np.float64)[legal]
+    legal_logits -= legal_logits.max()
+    exp = np.exp(legal_logits)
+    return (exp / exp.sum()).astype(np.float32)
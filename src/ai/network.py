@@ -0,0 +1,95 @@
+"""
+Policy/value network used to guide the tree search
+"""
+import os
+import numpy as np
+import torch
+import torch.nn as nn
+import torch.nn.functional as F
+
+
+class AlphaZeroNet(nn.Module):
+    """
+    MLP taking a flattened board observation and producing policy logits
+    over the action space and a value in [-1, 1] for the player to move.
+    """
+    def __init__(self, input_dim, hidden_dim=256, output_policy_dim=2401):
+        super(AlphaZeroNet, self).__init__()
+        self.input_dim = input_dim
+        self.hidden_dim = hidden_dim
+        self.output_policy_dim = output_policy_dim
+
+        self.fc1 = nn.Linear(input_dim, hidden_dim)
+        self.fc2 = nn.Linear(hidden_dim, hidden_dim)
+        # Policy head
+        self.policy_head = nn.Linear(hidden_dim, output_policy_dim)
+        # Value head
+        self.value_head = nn.Linear(hidden_dim, 1)
+
+    @classmethod
+    def for_env(cls, env, hidden_dim=256):
+        """Build a network sized for a HexGameEnv's observation and action spaces."""
+        input_dim = int(np.prod(env.observation_space.shape))
+        return cls(input_dim, hidden_dim=hidden_dim, output_policy_dim=int(env.action_space.n))
+
+    def forward(self, x):
+        # x shape: (batch, n_cells, channels) or already flattened (batch, input_dim)
+        x = x.flatten(start_dim=1)
+        x = F.relu(self.fc1(x))
+        x = F.relu(self.fc2(x))
+        policy_logits = self.policy_head(x)
+        value = torch.tanh(self.value_head(x))
+        return policy_logits, value
+
+
+class NetworkEvaluator:
+    """
+    MCTS evaluator running one forward pass per batch of observations.
+    """
+    def __init__(self, network, device="cpu"):
+        self.device = torch.device(device)
+        self.network = network.to(self.device)
+        self.network.eval()
+
+    def __call__(self, observations):
+        """
+        Args:
+            observations: Array of shape (batch, n_cells, channels)
+
+        Returns:
+            (policy_logits, values) as NumPy arrays of shape (batch, n_actions) and (batch,)
+        """
+        x = torch.from_numpy(np.ascontiguousarray(observations, dtype=np.float32)).to(self.device)
+        with torch.inference_mode():
+            policy_logits, values = self.network(x)
+        return policy_logits.float().cpu().numpy(), values.float().squeeze(-1).cpu().numpy()
+
+
+def save_checkpoint(network, path):
+    """
+    Save a network with the sizes needed to rebuild it.
+
+    The file is written next to its destination and moved into place, so a
+    process watching the path never loads a half-written checkpoint.
+    """
+    checkpoint = {
+        "input_dim": int(network.input_dim),
+        "hidden_dim": int(network.hidden_dim),
+        "output_policy_dim": int(network.output_policy_dim),
+        "state_dict": network.state_dict(),
+    }
+    tmp_path = f"{path}.tmp"
+    torch.save(checkpoint, tmp_path)
+    os.replace(tmp_path, path)
+
+
+def load_checkpoint(path, device="cpu"):
+    """Rebuild a network saved with save_checkpoint."""
+    checkpoint = torch.load(path, map_location=device)
+    network = AlphaZeroNet(
+        checkpoint["input_dim"],
+        hidden_dim=checkpoint["hidden_dim"],
+        output_policy_dim=checkpoint["output_policy_dim"],
+    )
+    network.load_state_dict(checkpoint["state_dict"])
+    return network.to(device)
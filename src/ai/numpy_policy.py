@@ -0,0 +1,132 @@
+"""
+NumPy inference of exported PPO policies
+
+Export a trained model once:
+    python -m src.ai.numpy_policy ppo_hex_game.zip ppo_hex_game.npz
+
+The .npz holds the weights of the policy MLP, so playing only needs NumPy:
+no torch or stable-baselines3 import, and one move costs a few
+microseconds of matrix products.
+"""
+import argparse
+
+import numpy as np
+
+ACTIVATIONS = {
+    "Tanh": np.tanh,
+    "ReLU": lambda x: np.maximum(x, 0.0),
+    "Identity": lambda x: x,
+}
+
+
+class NumpyPolicy:
+    """
+    Policy MLP (flatten -> hidden layers -> action logits) evaluated with NumPy.
+    """
+    def __init__(self, weights, biases, activation="Tanh"):
+        """
+        Args:
+            weights: Weight matrices of shape (in_features, out_features), action layer last
+            biases: Bias vectors matching weights
+            activation: Name of the hidden layer activation (a key of ACTIVATIONS)
+        """
+        if activation not in ACTIVATIONS:
+            raise ValueError(f"Unsupported activation: {activation}")
+        self.weights = [np.ascontiguousarray(w, dtype=np.float32) for w in weights]
+        self.biases = [np.asarray(b, dtype=np.float32) for b in biases]
+        self.activation = activation
+        self._activation_fn = ACTIVATIONS[activation]
+
+    @classmethod
+    def load(cls, path):
+        """Load a policy written by save()."""
+        with np.load(path) as data:
+            n_layers = int(data["n_layers"])
+            weights = [data[f"weight_{i}"] for i in range(n_layers)]
+            biases = [data[f"bias_{i}"] for i in range(n_layers)]
+            activation = str(data["activation"])
+        return cls(weights, biases, activation)
+
+    @classmethod
+    def from_model(cls, model):
+        """Extract the policy of a (Maskable)PPO model with an MlpPolicy."""
+        import torch.nn as nn
+
+        policy = model.policy
+        if type(policy.pi_features_extractor).__name__ != "FlattenExtractor":
+            raise ValueError("Only policies with a FlattenExtractor can be exported")
+
+        layers = [module for module in policy.mlp_extractor.policy_net if isinstance(module, nn.Linear)]
+        layers.append(policy.action_net)
+        weights = [layer.weight.detach().cpu().numpy().T for layer in layers]
+        biases = [layer.bias.detach().cpu().numpy() for layer in layers]
+        return cls(weights, biases, policy.activation_fn.__name__)
+
+    def save(self, path):
+        """Write the weights to an .npz file."""
+        arrays = {"n_layers": np.array(len(self.weights)), "activation": np.array(self.activation)}
+        for i, (weight, bias) in enumerate(zip(self.weights, self.biases)):
+            arrays[f"weight_{i}"] = weight
+            arrays[f"bias_{i}"] = bias
+        np.savez(path, **arrays)
+
+    def logits(self, observations):
+        """Action logits of a batch of observations, shape (batch, n_actions)."""
+        x = np.asarray(observations, dtype=np.float32).reshape(len(observations), -1)
+        last = len(self.weights) - 1
+        for i, (weight, bias) in enumerate(zip(self.weights, self.biases)):
+            x = x @ weight + bias
+            if i < last:
+                x = self._activation_fn(x)
+        return x
+
+    def predict(self, observation, action_mask=None):
+        """
+        Most probable action of a single observation.
+
+        Args:
+            observation: One observation
+            action_mask: Optional boolean mask, True for legal actions
+
+        Returns:
+            Flat action index
+        """
+        logits = self.logits(observation[np.newaxis])[0]
+        if action_mask is not None:
+            logits = np.where(action_mask, logits, -np.inf)
+        return int(np.argmax(logits))
+
+
+def load_policy(path):
+    """
+    Load a policy for inference.
+
+    .npz files are read directly; anything else is loaded as a MaskablePPO
+    model (which needs stable-baselines3) and converted.
+    """
+    if str(path).endswith(".npz"):
+        return NumpyPolicy.load(path)
+    from sb3_contrib import MaskablePPO
+    return NumpyPolicy.from_model(MaskablePPO.load(path, device="cpu"))
+
+
+def export_policy(model_path, output_path):
+    """Convert a saved MaskablePPO model to an .npz policy file."""
+    policy = load_policy(model_path)
+    policy.save(output_path)
+    return policy
+
+
+def main():
+    """Parse arguments and export a model."""
+    parser = argparse.ArgumentParser(description="Export a trained PPO policy to a NumPy .npz file")
+    parser.add_argument("model", help="Saved MaskablePPO model (.zip)")
+    parser.add_argument("output", help="Output .npz file")
+    args = parser.parse_args()
+
+    policy = export_policy(args.model, args.output)
+    print(f"Exported {len(policy.weights)} layers to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+"""
+Replay buffer backed by memory-mapped shards on disk
+"""
+import json
+import math
+import os
+
+import numpy as np
+
+from src.ai.symmetry import board_symmetries
+
+
+class ReplayBuffer:
+    """
+    Fixed-capacity FIFO buffer of (observation, policy, value) examples.
+
+    Examples live in fixed-size np.memmap shards: observations as bit-packed
+    uint8 rows, policies and values as float16. Only the pages actually touched
+    are held in RAM, so the buffer can hold tens of millions of positions.
+    The buffer is a ring: once capacity is reached, new examples overwrite the
+    oldest ones. The write cursor is saved to meta.json after every add, so
+    the buffer survives restarts and crashes; flush() also pushes the written
+    pages to disk.
+    """
+    def __init__(self, directory, capacity=1000000, observation_shape=(49, 10), n_actions=2401, shard_size=65536):
+        """
+        Args:
+            directory: Where the shard files and meta.json are kept
+            capacity: Maximum number of examples kept
+            observation_shape: Shape of one (binary) observation
+            n_actions: Size of a policy vector
+            shard_size: Examples per shard file
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+        meta_path = os.path.join(directory, "meta.json")
+        if os.path.exists(meta_path):
+            # Reopen an existing buffer with the geometry it was created with
+            with open(meta_path) as f:
+                meta = json.load(f)
+            capacity = meta["capacity"]
+            observation_shape = tuple(meta["observation_shape"])
+            n_actions = meta["n_actions"]
+            shard_size = meta["shard_size"]
+            self.total_added = meta["total_added"]
+            self.ingested = set(meta.get("ingested", []))
+        else:
+            self.total_added = 0
+            self.ingested = set()
+
+        self.capacity = capacity
+        self.observation_shape = tuple(observation_shape)
+        self.observation_size = int(np.prod(self.observation_shape))
+        self.packed_size = math.ceil(self.observation_size / 8)
+        self.n_actions = n_actions
+        self.shard_size = shard_size
+        self.n_shards = math.ceil(capacity / shard_size)
+
+        self._shards = [None] * self.n_shards
+        self._write_meta()
+
+    def __len__(self):
+        return min(self.total_added, self.capacity)
+
+    def __getstate__(self):
+        # Memmaps are reopened lazily in the receiving process (e.g. DataLoader workers)
+        state = self.__dict__.copy()
+        state["_shards"] = [None] * self.n_shards
+        return state
+
+    def _write_meta(self):
+        meta = {
+            "capacity": self.capacity,
+            "observation_shape": list(self.observation_shape),
+            "n_actions": self.n_actions,
+            "shard_size": self.shard_size,
+            "total_added": self.total_added,
+            "ingested": sorted(self.ingested),
+        }
+        path = os.path.join(self.directory, "meta.json")
+        with open(path + ".tmp", "w") as f:
+            json.dump(meta, f)
+        os.replace(path + ".tmp", path)
+
+    def _shard(self, index):
+        """Open (creating if needed) the memmaps of one shard."""
+        if self._shards[index] is None:
+            rows = min(self.shard_size, self.capacity - index * self.shard_size)
+            layout = {
+                "observations": (np.uint8, (rows, self.packed_size)),
+                "policies": (np.float16, (rows, self.n_actions)),
+                "values": (np.float16, (rows,)),
+            }
+            shard = {}
+            for name, (dtype, shape) in layout.items():
+                path = os.path.join(self.directory, f"{name}-{index:05d}.npy")
+                if os.path.exists(path):
+                    shard[name] = np.load(path, mmap_mode="r+")
+                else:
+                    shard[name] = np.lib.format.open_memmap(path, mode="w+", dtype=dtype, shape=shape)
+            self._shards[index] = shard
+        return self._shards[index]
+
+    def add(self, observations, policies, values):
+        """
+        Append a batch of examples, evicting the oldest ones when full.
+
+        Args:
+            observations: Array of shape (batch,) + observation_shape with 0/1 entries
+            policies: Array of shape (batch, n_actions)
+            values: Array of shape (batch,)
+        """
+        observations = np.asarray(observations)
+        batch = len(observations)
+        if batch == 0:
+            return
+
+        packed = np.packbits(observations.reshape(batch, -1).astype(bool), axis=1)
+        policies = np.asarray(policies, dtype=np.float16)
+        values = np.asarray(values, dtype=np.float16)
+
+        # A batch larger than the buffer only keeps its newest examples
+        if batch > self.capacity:
+            skip = batch - self.capacity
+            packed, policies, values = packed[skip:], policies[skip:], values[skip:]
+            self.total_added += skip
+            batch = self.capacity
+
+        # Write in runs that do not cross a shard boundary or the end of the ring
+        done = 0
+        while done < batch:
+            slot = (self.total_added + done) % self.capacity
+            shard_index, offset = divmod(slot, self.shard_size)
+            shard = self._shard(shard_index)
+            count = min(batch - done, len(shard["values"]) - offset)
+            shard["observations"][offset:offset + count] = packed[done:done + count]
+            shard["policies"][offset:offset + count] = policies[done:done + count]
+            shard["values"][offset:offset + count] = values[done:done + count]
+            done += count
+
+        self.total_added += batch
+        self._write_meta()
+
+    def sample(self, batch_size, rng=None, recency_half_life=None, augment=False):
+        """
+        Draw a random minibatch in O(batch_size), independent of the buffer size.
+
+        Args:
+            batch_size: Number of examples
+            rng: NumPy Generator (a fresh one is created if omitted)
+            recency_half_life: If set, an example's sampling weight halves every
+                recency_half_life positions of age; None samples uniformly
+            augment: Apply a random board symmetry to every example
+
+        Returns:
+            (observations, policies, values) as float32 arrays
+        """
+        size = len(self)
+        if size == 0:
+            raise ValueError("Cannot sample from an empty replay buffer")
+        rng = rng or np.random.default_rng()
+
+        if recency_half_life is None:
+            slots = rng.integers(0, size, size=batch_size)
+            if self.total_added > self.capacity:
+                slots = (self.total_added + slots) % self.capacity
+        else:
+            # Inverse CDF of an exponential distribution truncated to [0, size)
+            rate = math.log(2) / recency_half_life
+            u = rng.random(batch_size)
+            ages = -np.log1p(-u * -np.expm1(-rate * size)) / rate
+            ages = np.minimum(ages.astype(np.int64), size - 1)
+            slots = (self.total_added - 1 - ages) % self.capacity
+
+        observations, policies, values = self.gather(slots)
+        if augment:
+            observations, policies = board_symmetries().augment_random(observations, policies, rng)
+        return observations, policies, values
+
+    def gather(self, slots):
+        """Read the examples stored at the given ring slots."""
+        slots = np.asarray(slots, dtype=np.int64)
+        batch = len(slots)
+        packed = np.empty((batch, self.packed_size), dtype=np.uint8)
+        policies = np.empty((batch, self.n_actions), dtype=np.float32)
+        values = np.empty(batch, dtype=np.float32)
+
+        shard_indices, offsets = np.divmod(slots, self.shard_size)
+        for shard_index in np.unique(shard_indices):
+            rows = np.nonzero(shard_indices == shard_index)[0]
+            shard = self._shard(int(shard_index))
+            picked = offsets[rows]
+            packed[rows] = shard["observations"][picked]
+            policies[rows] = shard["policies"][picked]
+            values[rows] = shard["values"][picked]
+
+        observations = np.unpackbits(packed, axis=1, count=self.observation_size)
+        observations = observations.reshape((batch,) + self.observation_shape).astype(np.float32)
+        return observations, policies, values
+
+    def ingest(self, directory):
+        """
+        Add every self-play shard (.npz) in a directory that was not added before.
+
+        Shards are recorded by absolute path. Paths of this directory whose
+        file is gone are forgotten, so the record of ingested files stays as
+        small as the directories it covers.
+
+        Returns:
+            Number of examples added
+        """
+        directory = os.path.abspath(directory)
+        paths = sorted(os.path.join(directory, name) for name in os.listdir(directory) if name.endswith(".npz"))
+        present = set(paths)
+        self.ingested = {path for path in self.ingested if os.path.dirname(path) != directory or path in present}
+        added = 0
+        for path in paths:
+            if path in self.ingested:
+                continue
+            with np.load(path) as data:
+                # Marked first, so the meta written by add() records the file with its examples
+                self.ingested.add(path)
+                self.add(data["observations"], data["policies"], data["values"])
+                added += len(data["values"])
+        self.flush()
+        return added
+
+    def flush(self):
+        """Push written pages to disk and record the write cursor."""
+        for shard in self._shards:
+            if shard is not None:
+                for array in shard.values():
+                    array.flush()
+        self._write_meta()
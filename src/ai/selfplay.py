@@ -0,0 +1,375 @@
+"""
+Parallel self-play data generation
+
+A pool of worker processes plays games with MCTS and the current network and
+streams (observation, policy, value) examples, seen from the player to move,
+into sharded .npz files.
+Run with: python -m src.ai.selfplay --output-dir selfplay_data --checkpoint alpha_zero_checkpoint.pth
+"""
+import argparse
+import multiprocessing as mp
+import os
+import queue
+import signal
+import time
+
+import numpy as np
+
+from src.ai.encoding import mover_observation
+from src.ai.environment import HexGameEnv
+from src.ai.mcts import MCTS, UniformEvaluator
+from src.ai.zobrist import CachedEvaluator
+
+DEFAULT_OPTIONS = {
+    "simulations": 100,
+    "c_puct": 1.0,
+    "mcts_batch_size": 8,
+    "max_nodes": 1000000,
+    "temperature": 1.0,
+    "temperature_moves": 20,
+    "max_moves": 200,
+    "shard_size": 4096,
+    "reload_interval": 30.0,
+    "eval_cache_size": 0,
+    "shutdown_timeout": 600.0,
+}
+
+
+def play_game(env, mcts, rng, temperature=1.0, temperature_moves=20, max_moves=200):
+    """
+    Play one game of MCTS against itself.
+
+    Args:
+        env: HexGameEnv, reset by this function
+        mcts: MCTS instance used for both players
+        rng: NumPy Generator used to sample moves
+        temperature: Sampling temperature for the first temperature_moves moves
+        temperature_moves: Number of moves sampled from the visit distribution
+            before switching to the most visited move
+        max_moves: Games longer than this are stopped and scored as a draw
+
+    Returns:
+        (observations, policies, values, players) arrays; observations and
+        values are from the point of view of the player to move at each
+        position, players holds its index (0 = red, 1 = blue)
+    """
+    observation, _info = env.reset()
+    observations, policies, players = [], [], []
+    winner = None
+
+    for move in range(max_moves):
+        if len(env.legal_actions()) == 0:
+            break
+
+        pi = mcts.search(env)
+        observations.append(mover_observation(observation, env.current_player_idx))
+        policies.append(pi)
+        players.append(env.current_player_idx)
+
+        if move < temperature_moves and temperature > 0:
+            weights = pi.astype(np.float64) ** (1.0 / temperature)
+            action = rng.choice(len(pi), p=weights / weights.sum())
+        else:
+            action = int(np.argmax(pi))
+
+        observation, _reward, terminated, truncated, _info = env.step(action)
+        if terminated:
+            # The player who just moved won; the env already passed the turn on
+            winner = 1 - env.current_player_idx
+            break
+        if truncated:
+            break
+
+    players = np.array(players, dtype=np.int64)
+    if winner is None:
+        values = np.zeros(len(players), dtype=np.float32)
+    else:
+        values = np.where(players == winner, 1.0, -1.0).astype(np.float32)
+
+    return np.array(observations), np.array(policies), values, players
+
+
+class ShardWriter:
+    """
+    Buffers examples and writes them to fixed-size shard files.
+
+    Shards are written under a temporary name and renamed, so a reader
+    listing the directory only ever sees complete files. Games are never
+    split across shards; game_lengths gives the number of positions of each
+    game, in order.
+    """
+    def __init__(self, output_dir, prefix, shard_size=4096):
+        self.output_dir = output_dir
+        self.prefix = prefix
+        self.shard_size = shard_size
+        self.shard_index = 0
+        self._observations = []
+        self._policies = []
+        self._values = []
+        self._players = []
+        self._game_lengths = []
+        self._count = 0
+        os.makedirs(output_dir, exist_ok=True)
+
+    def add(self, observations, policies, values, players):
+        """Buffer the examples of one game."""
+        self._observations.append(observations)
+        self._policies.append(policies)
+        self._values.append(values)
+        self._players.append(players)
+        self._game_lengths.append(len(values))
+        self._count += len(values)
+        if self._count >= self.shard_size:
+            self.flush()
+
+    def flush(self):
+        """Write whatever is buffered as one shard."""
+        if self._count == 0:
+            return None
+
+        path = os.path.join(self.output_dir, f"{self.prefix}-{self.shard_index:06d}.npz")
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez_compressed(
+                f,
+                observations=np.concatenate(self._observations).astype(np.uint8),
+                policies=np.concatenate(self._policies).astype(np.float16),
+                values=np.concatenate(self._values).astype(np.float32),
+                players=np.concatenate(self._players).astype(np.uint8),
+                game_lengths=np.array(self._game_lengths, dtype=np.int32),
+            )
+        os.replace(tmp_path, path)
+
+        self.shard_index += 1
+        self._observations, self._policies, self._values, self._players = [], [], [], []
+        self._game_lengths = []
+        self._count = 0
+        return path
+
+
+def _worker_main(worker_id, generation, options, evaluator, stats, stop):
+    """Self-play worker process: play games until asked to stop."""
+    # The supervisor handles Ctrl+C and tells workers to stop through the event
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    rng = np.random.default_rng(options["seed"] + 1000 * generation + worker_id)
+    env = HexGameEnv()
+
+    checkpoint_path = options["checkpoint"]
+    loaded_mtime = None
+    next_reload_check = 0.0
+    if evaluator is None:
+        # Uniform priors until the checkpoint to watch (if any) is written
+        evaluator = UniformEvaluator(env.action_space.n)
+    if options["eval_cache_size"]:
+        evaluator = CachedEvaluator(evaluator, options["eval_cache_size"])
+
+    mcts = MCTS(
+        evaluator,
+        n_simulations=options["simulations"],
+        c_puct=options["c_puct"],
+        batch_size=options["mcts_batch_size"],
+        max_nodes=options["max_nodes"],
+    )
+    writer = ShardWriter(
+        options["output_dir"],
+        prefix=f"selfplay-{os.getpid()}-{worker_id:03d}-{generation:03d}",
+        shard_size=options["shard_size"],
+    )
+
+    try:
+        while not stop.is_set():
+            # Without an inference server each worker watches the checkpoint itself
+            if checkpoint_path is not None and options["local_network"] and time.monotonic() >= next_reload_check:
+                next_reload_check = time.monotonic() + options["reload_interval"]
+                mtime = os.stat(checkpoint_path).st_mtime_ns if os.path.exists(checkpoint_path) else None
+                if mtime is not None and mtime != loaded_mtime:
+                    from src.ai.network import NetworkEvaluator, load_checkpoint
+                    evaluator = NetworkEvaluator(load_checkpoint(checkpoint_path))
+                    if options["eval_cache_size"]:
+                        # Start from an empty cache so stale evaluations are not reused
+                        evaluator = CachedEvaluator(evaluator, options["eval_cache_size"])
+                    mcts.evaluator = evaluator
+                    loaded_mtime = mtime
+
+            start = time.monotonic()
+            observations, policies, values, players = play_game(
+                env, mcts, rng,
+                temperature=options["temperature"],
+                temperature_moves=options["temperature_moves"],
+                max_moves=options["max_moves"],
+            )
+            if len(values):
+                writer.add(observations, policies, values, players)
+            stats.put((worker_id, len(values), time.monotonic() - start))
+    finally:
+        writer.flush()
+
+
+def run_selfplay(output_dir, n_workers=None, checkpoint=None, use_server=True,
+                 max_games=None, duration=None, report_interval=60.0, seed=0, **options):
+    """
+    Run self-play workers until max_games games are played, duration seconds
+    have elapsed, or the process is interrupted.
+
+    Dead workers are restarted, so the pipeline can run unattended.
+
+    Args:
+        output_dir: Directory receiving the shard files
+        n_workers: Number of worker processes (defaults to the CPU count)
+        checkpoint: Network checkpoint; without one, MCTS uses uniform priors.
+            With use_server=False, workers also use uniform priors until it exists
+        use_server: Serve the network from one InferenceServer process instead
+            of loading a copy in every worker
+        max_games: Stop after this many games (None for no limit)
+        duration: Stop after this many seconds (None for no limit)
+        report_interval: Seconds between throughput reports
+        seed: Base random seed
+        **options: Overrides for the defaults in DEFAULT_OPTIONS
+
+    Returns:
+        Dict with the total games and positions generated
+    """
+    n_workers = n_workers or os.cpu_count() or 1
+    options = dict(DEFAULT_OPTIONS, **options)
+    options.update(output_dir=output_dir, checkpoint=checkpoint, seed=seed,
+                   local_network=checkpoint is not None and not use_server)
+
+    ctx = mp.get_context("spawn")
+    stats = ctx.Queue()
+    stop = ctx.Event()
+
+    server = None
+    if checkpoint is not None and use_server:
+        from src.ai.inference_server import InferenceServer
+        env = HexGameEnv()
+        server = InferenceServer(
+            checkpoint, n_workers, env.observation_space.shape, env.action_space.n,
+            slot_size=options["mcts_batch_size"], reload_interval=options["reload_interval"],
+            mp_context=ctx,
+        ).start()
+
+    def start_worker(worker_id, generation):
+        evaluator = server.client(worker_id) if server is not None else None
+        process = ctx.Process(
+            target=_worker_main,
+            args=(worker_id, generation, options, evaluator, stats, stop),
+            name=f"selfplay-{worker_id}",
+        )
+        process.start()
+        return process
+
+    generations = [0] * n_workers
+    workers = [start_worker(i, 0) for i in range(n_workers)]
+
+    # Ask for a clean shutdown on SIGTERM as well as Ctrl+C
+    previous_sigterm = signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())
+
+    total_games = 0
+    total_positions = 0
+    window_games = 0
+    window_positions = 0
+    start_time = time.monotonic()
+    window_start = start_time
+
+    try:
+        while not stop.is_set():
+            try:
+                _worker_id, positions, _seconds = stats.get(timeout=1.0)
+                total_games += 1
+                total_positions += positions
+                window_games += 1
+                window_positions += positions
+            except queue.Empty:
+                pass
+
+            now = time.monotonic()
+            if now - window_start >= report_interval:
+                elapsed = now - window_start
+                print(f"[selfplay] {window_games * 3600 / elapsed:.1f} games/hour, "
+                      f"{window_positions / elapsed:.1f} positions/sec "
+                      f"(total: {total_games} games, {total_positions} positions)")
+                window_games = window_positions = 0
+                window_start = now
+
+            if max_games is not None and total_games >= max_games:
+                break
+            if duration is not None and now - start_time >= duration:
+                break
+
+            # Restart crashed workers
+            for i, process in enumerate(workers):
+                if not process.is_alive() and not stop.is_set():
+                    print(f"[selfplay] worker {i} exited with code {process.exitcode}, restarting")
+                    generations[i] += 1
+                    workers[i] = start_worker(i, generations[i])
+
+            if server is not None and not server.is_alive():
+                print("[selfplay] inference server died, stopping")
+                break
+    except KeyboardInterrupt:
+        print("[selfplay] interrupted, waiting for workers to flush their shards")
+    finally:
+        stop.set()
+        for process in workers:
+            process.join(timeout=options["shutdown_timeout"])
+            if process.is_alive():
+                process.terminate()
+        if server is not None:
+            server.stop()
+        signal.signal(signal.SIGTERM, previous_sigterm)
+
+    # Games finished while shutting down
+    while True:
+        try:
+            _worker_id, positions, _seconds = stats.get_nowait()
+        except queue.Empty:
+            break
+        total_games += 1
+        total_positions += positions
+
+    elapsed = max(time.monotonic() - start_time, 1e-9)
+    print(f"[selfplay] done: {total_games} games, {total_positions} positions in {elapsed:.0f}s "
+          f"({total_games * 3600 / elapsed:.1f} games/hour, {total_positions / elapsed:.1f} positions/sec)")
+    return {"games": total_games, "positions": total_positions}
+
+
+def main():
+    """Parse arguments and run self-play."""
+    parser = argparse.ArgumentParser(description="Parallel self-play data generation")
+    parser.add_argument("--output-dir", default="selfplay_data", help="Directory for the shard files")
+    parser.add_argument("--workers", type=int, default=None, help="Number of worker processes (default: CPU count)")
+    parser.add_argument("--checkpoint", default=None, help="Network checkpoint (uniform priors if omitted)")
+    parser.add_argument("--no-server", action="store_true",
+                        help="Load the network in every worker instead of using an inference server")
+    parser.add_argument("--games", type=int, default=None, help="Stop after this many games")
+    parser.add_argument("--hours", type=float, default=None, help="Stop after this many hours")
+    parser.add_argument("--simulations", type=int, default=DEFAULT_OPTIONS["simulations"], help="MCTS simulations per move")
+    parser.add_argument("--mcts-batch-size", type=int, default=DEFAULT_OPTIONS["mcts_batch_size"], help="Leaves evaluated per MCTS round")
+    parser.add_argument("--max-moves", type=int, default=DEFAULT_OPTIONS["max_moves"], help="Move limit before a game is scored as a draw")
+    parser.add_argument("--eval-cache-size", type=int, default=DEFAULT_OPTIONS["eval_cache_size"],
+                        help="Positions kept in each worker's symmetry-shared evaluation cache (0 disables it)")
+    parser.add_argument("--shard-size", type=int, default=DEFAULT_OPTIONS["shard_size"], help="Positions per shard file")
+    parser.add_argument("--report-interval", type=float, default=60.0, help="Seconds between throughput reports")
+    parser.add_argument("--seed", type=int, default=0, help="Base random seed")
+    args = parser.parse_args()
+
+    run_selfplay(
+        args.output_dir,
+        n_workers=args.workers,
+        checkpoint=args.checkpoint,
+        use_server=not args.no_server,
+        max_games=args.games,
+        duration=args.hours * 3600 if args.hours is not None else None,
+        report_interval=args.report_interval,
+        seed=args.seed,
+        simulations=args.simulations,
+        mcts_batch_size=args.mcts_batch_size,
+        max_moves=args.max_moves,
+        eval_cache_size=args.eval_cache_size,
+        shard_size=args.shard_size,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Board symmetries - cell and action permutation tables for data augmentation
+
+The candidate transforms are the 12 rotations and reflections of the hex grid.
+Only those mapping both the playable cells and the forbidden cells onto
+themselves are kept; for the standard board these are the 6 rotations
+(the outer cells are laid out in a pinwheel, which rules out reflections).
+"""
+import functools
+
+import numpy as np
+
+from src.core.board import Board
+from src.core.cell_index import CELLS
+
+
+def _rotate(q, r, s):
+    """Rotate cube coordinates by 60 degrees."""
+    return -r, -s, -q
+
+
+def _reflect(q, r, s):
+    """Mirror cube coordinates across the q axis."""
+    return q, s, r
+
+
+def _transform(coords, rotations, reflected):
+    if reflected:
+        coords = _reflect(*coords)
+    for _ in range(rotations):
+        coords = _rotate(*coords)
+    return coords
+
+
+class SymmetryTables:
+    """
+    Permutation tables of the board's symmetry group, computed once.
+
+    Attributes:
+        names: Human-readable name of each transform (index 0 is the identity)
+        cell_perm: (G, n_cells) array, cell_perm[g, i] is the index of the image of cell i
+        cell_gather: (G, n_cells) inverse permutations, so obs[..., cell_gather[g], :]
+            is the observation transformed by g
+        action_gather: (G, n_cells**2) array, policy[..., action_gather[g]] is the
+            policy transformed by g for the flat (source * n_cells + target) encoding
+    """
+    def __init__(self, cells, forbidden_cells):
+        """
+        Args:
+            cells: Board cells in observation/action index order
+            forbidden_cells: Cells that must map onto forbidden cells
+        """
+        coords = [(cell.q, cell.r, cell.s) for cell in cells]
+        index = {c: i for i, c in enumerate(coords)}
+        forbidden = {(cell.q, cell.r, cell.s) for cell in forbidden_cells}
+        n_cells = len(coords)
+
+        names = []
+        perms = []
+        for reflected in (False, True):
+            for rotations in range(6):
+                images = [_transform(c, rotations, reflected) for c in coords]
+                if any(image not in index for image in images):
+                    continue
+                if {_transform(c, rotations, reflected) for c in forbidden} != forbidden:
+                    continue
+                names.append(("reflect+" if reflected else "") + f"rot{60 * rotations}")
+                perms.append([index[image] for image in images])
+
+        self.names = names
+        self.n_cells = n_cells
+        self.cell_perm = np.array(perms, dtype=np.int64)
+        self.cell_gather = np.argsort(self.cell_perm, axis=1)
+
+        # Action (s, t) maps to (perm[s], perm[t]); build the gather form directly
+        source_gather = self.cell_gather[:, :, np.newaxis]
+        target_gather = self.cell_gather[:, np.newaxis, :]
+        self.action_gather = (source_gather * n_cells + target_gather).reshape(len(perms), n_cells * n_cells)
+        self.action_perm = np.argsort(self.action_gather, axis=1)
+
+    def __len__(self):
+        return len(self.names)
+
+    def transform_observations(self, observations, g):
+        """Apply transform g to a batch of (batch, n_cells, channels) observations."""
+        return observations[:, self.cell_gather[g]]
+
+    def transform_policies(self, policies, g):
+        """Apply transform g to a batch of (batch, n_cells**2) policies."""
+        return policies[:, self.action_gather[g]]
+
+    def transform_actions(self, actions, g):
+        """Map flat action indices through transform g."""
+        return self.action_perm[g][actions]
+
+    def augment_all(self, observations, policies, values):
+        """
+        Expand a batch with every symmetric copy.
+
+        Returns:
+            Arrays with len(self) * batch examples, grouped by transform
+        """
+        group = len(self)
+        obs = observations[:, self.cell_gather]        # (batch, G, n_cells, channels)
+        pol = policies[:, self.action_gather]          # (batch, G, n_actions)
+        obs = np.swapaxes(obs, 0, 1).reshape((-1,) + observations.shape[1:])
+        pol = np.swapaxes(pol, 0, 1).reshape(-1, policies.shape[1])
+        return obs, pol, np.tile(values, group)
+
+    def augment_random(self, observations, policies, rng):
+        """Apply an independently drawn transform to every example of a batch."""
+        batch = len(observations)
+        g = rng.integers(0, len(self), size=batch)
+        rows = np.arange(batch)[:, np.newaxis]
+        return observations[rows, self.cell_gather[g]], policies[rows, self.action_gather[g]]
+
+
+@functools.lru_cache(maxsize=None)
+def board_symmetries():
+    """Symmetry tables of the standard board, in the same cell order as HexGameEnv."""
+    return SymmetryTables(CELLS, Board().forbidden_cells)
@@ -2,13 +2,14 @@
 Training script for reinforcement learning agents
 """
 import os
-import matplotlib.pyplot as plt
-import pygame
-from stable_baselines3 import PPO
+from sb3_contrib import MaskablePPO
 from stable_baselines3.common.env_checker import check_env
 from stable_baselines3.common.callbacks import BaseCallback
+from stable_baselines3.common.vec_env import VecMonitor
 
 from src.ai.environment import HexGameEnv
+from src.ai.numpy_policy import NumpyPolicy
+from src.ai.vec_env import SharedMemoryVecEnv
 
 class PlottingCallback(BaseCallback):
     """Callback for plotting rewards during training."""
@@ -29,6 +30,7 @@ class PlottingCallback(BaseCallback):
 
     def _on_training_end(self):
         # Plot the reward curve at the end of training
+        import matplotlib.pyplot as plt
         plt.figure(figsize=(12, 6))
         plt.plot(self.episode_rewards)
         plt.xlabel("Episodes")
@@ -36,17 +38,23 @@ class PlottingCallback(BaseCallback):
         plt.title("Reward During Training")
         plt.show()
 
-def train_agent(total_timesteps=200000, model_save_path="ppo_hex_game"):
+def train_agent(total_timesteps=200000, model_save_path="ppo_hex_game", n_envs=None, n_workers=None):
     """
     Train a PPO agent on the hexagonal game.
     
+    MaskablePPO reads HexGameEnv.action_masks() at every step, so only
+    legal actions are ever sampled. Rollouts are collected from n_envs games
+    stepped in parallel worker processes.
+    
     Args:
         total_timesteps: Number of steps to train for
         model_save_path: Where to save the trained model
+        n_envs: Number of games played in parallel (defaults to the CPU count)
+        n_workers: Number of worker processes (defaults to min(n_envs, CPU count))
         
     Returns:
         model: Trained PPO model
-        env: Game environment
+        env: Game environment for evaluation
     """
     # Create the environment
     env = HexGameEnv()
@@ -54,10 +62,13 @@ def train_agent(total_timesteps=200000, model_save_path="ppo_hex_game"):
     # Validate the environment conforms to Gym API
     check_env(env, warn=True)
     
+    n_envs = n_envs or os.cpu_count() or 1
+    train_env = VecMonitor(SharedMemoryVecEnv(n_envs=n_envs, n_workers=n_workers))
+    
     # Create the PPO model with decreasing learning rate
-    model = PPO(
+    model = MaskablePPO(
         "MlpPolicy",
-        env,
+        train_env,
         verbose=1,
         learning_rate=lambda progress_remaining: progress_remaining * 0.01,
         tensorboard_log="./logs/"
@@ -67,15 +78,22 @@ def train_agent(total_timesteps=200000, model_save_path="ppo_hex_game"):
     plotting_callback = PlottingCallback()
     
     # Train the model
-    model.learn(
-        total_timesteps=total_timesteps,
-        callback=plotting_callback
-    )
+    try:
+        model.learn(
+            total_timesteps=total_timesteps,
+            callback=plotting_callback
+        )
+    finally:
+        train_env.close()
     
     # Save the trained model
     model.save(model_save_path)
     print(f"Model saved to {model_save_path}")
     
+    # Export the policy weights for NumPy inference (RLPlayer)
+    NumpyPolicy.from_model(model).save(f"{model_save_path}.npz")
+    print(f"Policy exported to {model_save_path}.npz")
+    
     return model, env
 
 def evaluate_agent(model, env, episodes=5, render=True):
@@ -88,6 +106,9 @@ def evaluate_agent(model, env, episodes=5, render=True):
         episodes: Number of episodes to evaluate
         render: Whether to render the environment
     """
+    if render:
+        import pygame
+    
     for episode in range(episodes):
         obs, info = env.reset()
         done = False
@@ -95,8 +116,8 @@ def evaluate_agent(model, env, episodes=5, render=True):
         step_count = 0
         
         while not done:
-            # Get action from model
-            action, _states = model.predict(obs, deterministic=True)
+            # Get action from model, restricted to legal actions
+            action, _states = model.predict(obs, deterministic=True, action_masks=env.action_masks())
             
             # Execute action
             obs, reward, terminated, truncated, info = env.step(action)
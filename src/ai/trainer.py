@@ -0,0 +1,244 @@
+"""
+Minibatch training of the policy/value network from the replay buffer
+Run with: python -m src.ai.trainer --buffer replay_buffer --ingest selfplay_data --checkpoint alpha_zero_checkpoint.pth
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+import torch
+import torch.nn.functional as F
+from torch.utils.data import DataLoader, IterableDataset, get_worker_info
+
+from src.ai.network import AlphaZeroNet, load_checkpoint, save_checkpoint
+from src.ai.replay_buffer import ReplayBuffer
+from src.ai.symmetry import board_symmetries
+
+
+class ReplayBatches(IterableDataset):
+    """
+    Streams whole minibatches out of a ReplayBuffer.
+
+    One pass is an epoch: a random permutation of the buffer split into
+    batches, shared out between the DataLoader workers. With a recency
+    half-life the batches are drawn with ReplayBuffer.sample instead.
+    """
+    def __init__(self, buffer, batch_size, augment=True, recency_half_life=None, seed=0):
+        self.buffer = buffer
+        self.batch_size = batch_size
+        self.augment = augment
+        self.recency_half_life = recency_half_life
+        self.seed = seed
+        self.epoch = 0
+
+    def __len__(self):
+        return len(self.buffer) // self.batch_size
+
+    def set_epoch(self, epoch):
+        self.epoch = epoch
+
+    def __iter__(self):
+        worker = get_worker_info()
+        worker_id, n_workers = (worker.id, worker.num_workers) if worker is not None else (0, 1)
+
+        # Every worker draws the same permutation and keeps its own share of the batches
+        rng = np.random.default_rng((self.seed, self.epoch))
+        worker_rng = np.random.default_rng((self.seed, self.epoch, worker_id))
+        n_batches = len(self)
+        order = rng.permutation(len(self.buffer))[:n_batches * self.batch_size].reshape(n_batches, self.batch_size)
+
+        for batch_index in range(worker_id, n_batches, n_workers):
+            if self.recency_half_life is None:
+                # Sorted slots read the memmaps in file order
+                observations, policies, values = self.buffer.gather(np.sort(order[batch_index]))
+                if self.augment:
+                    observations, policies = board_symmetries().augment_random(observations, policies, worker_rng)
+            else:
+                observations, policies, values = self.buffer.sample(
+                    self.batch_size, worker_rng, recency_half_life=self.recency_half_life, augment=self.augment
+                )
+            yield torch.from_numpy(observations), torch.from_numpy(policies), torch.from_numpy(values)
+
+
+def _cpu_has_native_bf16():
+    """True if the CPU advertises bfloat16 instructions (AVX512-BF16 or AMX)."""
+    try:
+        with open("/proc/cpuinfo") as f:
+            flags = f.read()
+    except OSError:
+        # Not Linux: no way to tell, keep float32
+        return False
+    return "avx512_bf16" in flags or "amx_bf16" in flags
+
+
+def _bf16_autocast_works(device):
+    """Run a tiny matmul under bfloat16 autocast to check this torch build supports it."""
+    try:
+        with torch.autocast(device_type=device.type, dtype=torch.bfloat16):
+            x = torch.ones(2, 2, device=device)
+            x @ x
+    except (RuntimeError, TypeError):
+        return False
+    return True
+
+
+def _autocast_dtype(device, amp):
+    """Pick the mixed-precision dtype, or None to train in float32."""
+    if not amp:
+        return None
+    if device.type == "cuda":
+        return torch.float16
+    # bfloat16 autocast only pays off on CPUs with native bf16 support
+    if amp == "auto" and not _cpu_has_native_bf16():
+        return None
+    if not _bf16_autocast_works(device):
+        print("bfloat16 autocast is not available on this device, training in float32")
+        return None
+    return torch.bfloat16
+
+
+def train_network(network, buffer, epochs=1, batch_size=1024, learning_rate=1e-3, weight_decay=1e-4,
+                  accumulation_steps=1, amp="auto", num_workers=2, prefetch_factor=4,
+                  recency_half_life=None, augment=True, checkpoint_path=None, log_interval=50,
+                  device=None, seed=0):
+    """
+    Train a network on minibatches streamed from a replay buffer.
+
+    Args:
+        network: AlphaZeroNet to train
+        buffer: ReplayBuffer holding the examples
+        epochs: Number of passes over the buffer
+        batch_size: Examples per minibatch
+        learning_rate: AdamW learning rate
+        weight_decay: AdamW weight decay
+        accumulation_steps: Minibatches whose gradients are summed before each optimizer step
+        amp: True, False or "auto" (mixed precision where the hardware supports it)
+        num_workers: DataLoader worker processes preparing batches
+        prefetch_factor: Batches prepared ahead by each worker
+        recency_half_life: Sample with a recency weight instead of epoch permutations
+        augment: Apply a random board symmetry to every example
+        checkpoint_path: If set, the network is saved there after every epoch
+        log_interval: Optimizer steps between throughput logs
+        device: Torch device (CUDA if available, otherwise CPU)
+        seed: Seed of the batch permutations
+
+    Returns:
+        List of the average loss of each epoch
+    """
+    device = torch.device(device or ("cuda" if torch.cuda.is_available() else "cpu"))
+    network = network.to(device)
+    network.train()
+
+    optimizer = torch.optim.AdamW(network.parameters(), lr=learning_rate, weight_decay=weight_decay)
+    autocast_dtype = _autocast_dtype(device, amp)
+    scaler = torch.amp.GradScaler("cuda", enabled=autocast_dtype == torch.float16)
+
+    dataset = ReplayBatches(buffer, batch_size, augment=augment, recency_half_life=recency_half_life, seed=seed)
+    loader = DataLoader(
+        dataset,
+        batch_size=None,  # The dataset already yields whole batches
+        num_workers=num_workers,
+        pin_memory=device.type == "cuda",
+        prefetch_factor=prefetch_factor if num_workers > 0 else None,
+        persistent_workers=False,
+    )
+
+    epoch_losses = []
+    for epoch in range(epochs):
+        dataset.set_epoch(epoch)
+        total_loss = 0.0
+        n_batches = 0
+        window_samples = 0
+        window_start = time.perf_counter()
+        optimizer.zero_grad(set_to_none=True)
+
+        for step, (observations, policies, values) in enumerate(loader, start=1):
+            observations = observations.to(device, non_blocking=True)
+            policies = policies.to(device, non_blocking=True)
+            values = values.to(device, non_blocking=True)
+
+            with torch.autocast(device_type=device.type, dtype=autocast_dtype or torch.float32,
+                                enabled=autocast_dtype is not None):
+                pred_logits, pred_values = network(observations)
+                loss_policy = -torch.sum(policies * F.log_softmax(pred_logits.float(), dim=1), dim=1).mean()
+                loss_value = F.mse_loss(pred_values.float().squeeze(-1), values)
+                loss = loss_policy + loss_value
+
+            scaler.scale(loss / accumulation_steps).backward()
+            if step % accumulation_steps == 0:
+                scaler.step(optimizer)
+                scaler.update()
+                optimizer.zero_grad(set_to_none=True)
+
+            total_loss += loss.item()
+            n_batches += 1
+            window_samples += len(values)
+
+            if step % (log_interval * accumulation_steps) == 0:
+                elapsed = time.perf_counter() - window_start
+                print(f"Epoch {epoch + 1}/{epochs} step {step}/{len(dataset)} "
+                      f"loss {total_loss / n_batches:.4f} ({window_samples / elapsed:.0f} samples/sec)")
+                window_samples = 0
+                window_start = time.perf_counter()
+
+        # Apply the gradients of a last incomplete accumulation window
+        if n_batches % accumulation_steps:
+            scaler.step(optimizer)
+            scaler.update()
+            optimizer.zero_grad(set_to_none=True)
+
+        epoch_loss = total_loss / max(n_batches, 1)
+        epoch_losses.append(epoch_loss)
+        print(f"Epoch {epoch + 1}/{epochs} Loss: {epoch_loss:.4f}")
+
+        if checkpoint_path is not None:
+            save_checkpoint(network, checkpoint_path)
+
+    return epoch_losses
+
+
+def main():
+    """Parse arguments, fill the replay buffer and train."""
+    parser = argparse.ArgumentParser(description="Train the policy/value network from the replay buffer")
+    parser.add_argument("--buffer", default="replay_buffer", help="Replay buffer directory")
+    parser.add_argument("--capacity", type=int, default=10000000, help="Replay buffer capacity (new buffers only)")
+    parser.add_argument("--ingest", default=None, help="Self-play shard directory to add to the buffer first")
+    parser.add_argument("--checkpoint", default="alpha_zero_checkpoint.pth", help="Checkpoint to resume from and save to")
+    parser.add_argument("--epochs", type=int, default=1)
+    parser.add_argument("--batch-size", type=int, default=1024)
+    parser.add_argument("--accumulation-steps", type=int, default=1)
+    parser.add_argument("--lr", type=float, default=1e-3)
+    parser.add_argument("--workers", type=int, default=2, help="DataLoader worker processes")
+    parser.add_argument("--recency-half-life", type=int, default=None,
+                        help="Sample recent positions more often (in positions of age)")
+    parser.add_argument("--no-amp", action="store_true", help="Disable mixed precision")
+    parser.add_argument("--no-augment", action="store_true", help="Disable symmetry augmentation")
+    args = parser.parse_args()
+
+    buffer = ReplayBuffer(args.buffer, capacity=args.capacity)
+    if args.ingest:
+        added = buffer.ingest(args.ingest)
+        print(f"Added {added} positions, buffer holds {len(buffer)}")
+
+    if os.path.exists(args.checkpoint):
+        network = load_checkpoint(args.checkpoint)
+    else:
+        network = AlphaZeroNet(buffer.observation_size, output_policy_dim=buffer.n_actions)
+
+    train_network(
+        network, buffer,
+        epochs=args.epochs,
+        batch_size=args.batch_size,
+        learning_rate=args.lr,
+        accumulation_steps=args.accumulation_steps,
+        amp=not args.no_amp and "auto",
+        num_workers=args.workers,
+        recency_half_life=args.recency_half_life,
+        augment=not args.no_augment,
+        checkpoint_path=args.checkpoint,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,271 @@
+"""
+Vectorized HexGameEnv running games in worker processes
+
+Observations, rewards, done flags and action masks are exchanged through
+shared-memory arrays; the pipes only carry short commands and the (small)
+info dicts.
+"""
+import multiprocessing as mp
+import os
+from multiprocessing import shared_memory
+
+import numpy as np
+from stable_baselines3.common.vec_env.base_vec_env import CloudpickleWrapper, VecEnv
+
+from src.ai.environment import HexGameEnv
+
+
+def _shared_array(block, shape, dtype):
+    return np.ndarray(shape, dtype=dtype, buffer=block.buf)
+
+
+def _worker(remote, parent_remote, env_fns_wrapper, first, layout):
+    """Worker process stepping the environments first .. first + len(env_fns) - 1."""
+    parent_remote.close()
+    envs = [env_fn() for env_fn in env_fns_wrapper.var]
+    count = len(envs)
+
+    blocks = {name: shared_memory.SharedMemory(name=shm_name) for name, (shm_name, _shape, _dtype) in layout.items()}
+    arrays = {
+        name: _shared_array(blocks[name], shape, np.dtype(dtype))[first:first + count]
+        for name, (_shm_name, shape, dtype) in layout.items()
+    }
+
+    def publish(i, observation, info):
+        # The mask travels through shared memory, not through the pipe
+        arrays["observations"][i] = observation
+        mask = info.pop("action_mask", None)
+        arrays["action_masks"][i] = mask if mask is not None else envs[i].action_mask()
+
+    try:
+        while True:
+            try:
+                cmd, data = remote.recv()
+            except EOFError:
+                break
+
+            if cmd == "step":
+                infos, reset_infos = [], []
+                for i, env in enumerate(envs):
+                    observation, reward, terminated, truncated, info = env.step(int(arrays["actions"][i]))
+                    done = terminated or truncated
+                    info["TimeLimit.truncated"] = truncated and not terminated
+                    reset_info = {}
+                    if done:
+                        # Auto-reset: keep the final observation for the learner
+                        info["terminal_observation"] = observation
+                        info.pop("action_mask", None)
+                        observation, reset_info = env.reset()
+                        publish(i, observation, reset_info)
+                    else:
+                        publish(i, observation, info)
+                    arrays["rewards"][i] = reward
+                    arrays["dones"][i] = done
+                    infos.append(info)
+                    reset_infos.append(reset_info)
+                remote.send((infos, reset_infos))
+            elif cmd == "reset":
+                seeds, options = data
+                reset_infos = []
+                for i, env in enumerate(envs):
+                    kwargs = {"options": options[i]} if options[i] else {}
+                    observation, reset_info = env.reset(seed=seeds[i], **kwargs)
+                    publish(i, observation, reset_info)
+                    reset_infos.append(reset_info)
+                remote.send(reset_infos)
+            elif cmd == "env_method":
+                indices, method_name, args, kwargs = data
+                remote.send([getattr(envs[i], method_name)(*args, **kwargs) for i in indices])
+            elif cmd == "get_attr":
+                indices, attr_name = data
+                remote.send([getattr(envs[i], attr_name) for i in indices])
+            elif cmd == "has_attr":
+                remote.send(hasattr(envs[0], data))
+            elif cmd == "set_attr":
+                indices, attr_name, value = data
+                for i in indices:
+                    setattr(envs[i], attr_name, value)
+                remote.send(None)
+            elif cmd == "close":
+                for env in envs:
+                    env.close()
+                remote.send(None)
+                break
+            else:
+                raise NotImplementedError(f"`{cmd}` is not implemented in the worker")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        arrays = None
+        for block in blocks.values():
+            block.close()
+        remote.close()
+
+
+class SharedMemoryVecEnv(VecEnv):
+    """
+    Stable-Baselines3 VecEnv stepping HexGameEnv instances in worker processes.
+
+    Each worker hosts a contiguous slice of the environments. step() writes the
+    actions into a shared array and sends one short "step" command per worker;
+    the workers write observations, rewards, done flags and action masks back
+    into shared arrays, resetting finished games automatically.
+    action_masks() reads the masks straight from shared memory, which is what
+    MaskablePPO calls on every step.
+    """
+    def __init__(self, env_fns=None, n_envs=None, n_workers=None, start_method=None):
+        """
+        Args:
+            env_fns: List of callables creating the environments (defaults to HexGameEnv)
+            n_envs: Number of environments when env_fns is omitted
+            n_workers: Number of worker processes (defaults to min(n_envs, CPU count))
+            start_method: multiprocessing start method (forkserver when available)
+        """
+        if env_fns is None:
+            env_fns = [HexGameEnv] * (n_envs or os.cpu_count() or 1)
+        num_envs = len(env_fns)
+        n_workers = max(1, min(n_workers or os.cpu_count() or 1, num_envs))
+
+        probe = env_fns[0]()
+        observation_space, action_space = probe.observation_space, probe.action_space
+        probe.close()
+        super().__init__(num_envs, observation_space, action_space)
+
+        shapes = {
+            "observations": ((num_envs,) + observation_space.shape, observation_space.dtype),
+            "action_masks": ((num_envs, action_space.n), np.bool_),
+            "actions": ((num_envs,), np.int64),
+            "rewards": ((num_envs,), np.float32),
+            "dones": ((num_envs,), np.bool_),
+        }
+        self._blocks = {}
+        self._arrays = {}
+        layout = {}
+        for name, (shape, dtype) in shapes.items():
+            dtype = np.dtype(dtype)
+            block = shared_memory.SharedMemory(create=True, size=max(1, int(np.prod(shape)) * dtype.itemsize))
+            self._blocks[name] = block
+            self._arrays[name] = _shared_array(block, shape, dtype)
+            layout[name] = (block.name, shape, dtype.str)
+
+        if start_method is None:
+            start_method = "forkserver" if "forkserver" in mp.get_all_start_methods() else "spawn"
+        ctx = mp.get_context(start_method)
+
+        # Split the environments into contiguous slices, one per worker
+        bounds = np.linspace(0, num_envs, n_workers + 1).astype(int)
+        self._slices = [(int(bounds[w]), int(bounds[w + 1])) for w in range(n_workers)]
+        self.remotes, self.processes = [], []
+        for first, last in self._slices:
+            remote, work_remote = ctx.Pipe()
+            process = ctx.Process(
+                target=_worker,
+                args=(work_remote, remote, CloudpickleWrapper(env_fns[first:last]), first, layout),
+                daemon=True,
+            )
+            process.start()
+            work_remote.close()
+            self.remotes.append(remote)
+            self.processes.append(process)
+
+        self.waiting = False
+        self.closed = False
+
+    def _split(self, indices):
+        """Group environment indices by worker, as worker-local indices."""
+        groups = []
+        for w, (first, last) in enumerate(self._slices):
+            local = [i - first for i in indices if first <= i < last]
+            if local:
+                groups.append((w, local))
+        return groups
+
+    def step_async(self, actions):
+        self._arrays["actions"][:] = actions
+        for remote in self.remotes:
+            remote.send(("step", None))
+        self.waiting = True
+
+    def step_wait(self):
+        infos = []
+        for w, remote in enumerate(self.remotes):
+            worker_infos, worker_reset_infos = remote.recv()
+            infos.extend(worker_infos)
+            first = self._slices[w][0]
+            for i, reset_info in enumerate(worker_reset_infos):
+                if reset_info:
+                    self.reset_infos[first + i] = reset_info
+        self.waiting = False
+        return (
+            self._arrays["observations"].copy(),
+            self._arrays["rewards"].copy(),
+            self._arrays["dones"].copy(),
+            infos,
+        )
+
+    def reset(self):
+        for w, (first, last) in enumerate(self._slices):
+            seeds = [self._seeds[i] for i in range(first, last)]
+            options = [self._options[i] for i in range(first, last)]
+            self.remotes[w].send(("reset", (seeds, options)))
+        for w, remote in enumerate(self.remotes):
+            first = self._slices[w][0]
+            for i, reset_info in enumerate(remote.recv()):
+                self.reset_infos[first + i] = reset_info
+        self._reset_seeds()
+        self._reset_options()
+        return self._arrays["observations"].copy()
+
+    def action_masks(self):
+        """Legal action masks of every environment, shape (num_envs, n_actions)."""
+        return self._arrays["action_masks"].copy()
+
+    def env_method(self, method_name, *method_args, indices=None, **method_kwargs):
+        indices = list(self._get_indices(indices))
+        if method_name in ("action_masks", "action_mask"):
+            return list(self._arrays["action_masks"][indices])
+        groups = self._split(indices)
+        for w, local in groups:
+            self.remotes[w].send(("env_method", (local, method_name, method_args, method_kwargs)))
+        return [result for w, _local in groups for result in self.remotes[w].recv()]
+
+    def get_attr(self, attr_name, indices=None):
+        groups = self._split(list(self._get_indices(indices)))
+        for w, local in groups:
+            self.remotes[w].send(("get_attr", (local, attr_name)))
+        return [result for w, _local in groups for result in self.remotes[w].recv()]
+
+    def has_attr(self, attr_name):
+        self.remotes[0].send(("has_attr", attr_name))
+        return self.remotes[0].recv()
+
+    def set_attr(self, attr_name, value, indices=None):
+        groups = self._split(list(self._get_indices(indices)))
+        for w, local in groups:
+            self.remotes[w].send(("set_attr", (local, attr_name, value)))
+        for w, _local in groups:
+            self.remotes[w].recv()
+
+    def env_is_wrapped(self, wrapper_class, indices=None):
+        return [False for _ in self._get_indices(indices)]
+
+    def close(self):
+        if self.closed:
+            return
+        if self.waiting:
+            for remote in self.remotes:
+                remote.recv()
+        for remote in self.remotes:
+            remote.send(("close", None))
+        for remote in self.remotes:
+            try:
+                remote.recv()
+            except EOFError:
+                pass
+        for process in self.processes:
+            process.join()
+        self._arrays = {}
+        for block in self._blocks.values():
+            block.close()
+            block.unlink()
+        self.closed = True
@@ -0,0 +1,127 @@
+"""
+Zobrist hashing with symmetry canonicalisation
+
+Symmetric positions get the same canonical key, so transposition tables,
+evaluation caches and opening books can share one entry between them.
+"""
+from collections import OrderedDict
+
+import numpy as np
+
+from src.ai.symmetry import board_symmetries
+
+
+class ZobristTable:
+    """
+    Random 64-bit keys per (cell, cell code), plus one for the side to move.
+
+    A cell code is the index of the observation channel set for that cell
+    (0 = empty, 9 = forbidden, pieces in between).
+    """
+    def __init__(self, n_cells, n_codes=10, seed=0x5EED):
+        rng = np.random.default_rng(seed)
+        self.keys = rng.integers(0, np.iinfo(np.uint64).max, size=(n_cells, n_codes), dtype=np.uint64, endpoint=True)
+        self.side_key = rng.integers(0, np.iinfo(np.uint64).max, dtype=np.uint64, endpoint=True)
+        self._cells = np.arange(n_cells)
+
+    def hash(self, codes, side_to_move=0):
+        """Zobrist key of a position given as an (n_cells,) array of cell codes."""
+        key = np.bitwise_xor.reduce(self.keys[self._cells, codes])
+        return int(key ^ self.side_key) if side_to_move else int(key)
+
+    def canonical_hash(self, codes, side_to_move=0, symmetries=None):
+        """
+        Minimum Zobrist key over the board's symmetry group.
+
+        Args:
+            codes: (n_cells,) array of cell codes
+            side_to_move: 0 or 1
+            symmetries: SymmetryTables (defaults to the standard board's)
+
+        Returns:
+            (key, g): the canonical key and the index of the transform that maps
+            the position onto its canonical form
+        """
+        symmetries = symmetries or board_symmetries()
+        # Under transform g, cell i moves to cell_perm[g, i] and keeps its code
+        keys = np.bitwise_xor.reduce(self.keys[symmetries.cell_perm, codes[np.newaxis, :]], axis=1)
+        g = int(np.argmin(keys))
+        key = keys[g] ^ self.side_key if side_to_move else keys[g]
+        return int(key), g
+
+
+def observation_codes(observations):
+    """Cell codes of a batch of (batch, n_cells, channels) one-hot observations."""
+    return np.argmax(observations, axis=-1)
+
+
+class CachedEvaluator:
+    """
+    Evaluator wrapper caching results under the canonical key of each position.
+
+    Policies are stored in the canonical frame and mapped back through the
+    inverse transform on a hit, so every symmetric variant of a position
+    shares one entry. Only cache misses reach the wrapped evaluator, still
+    as a single batch. Entries are evicted least recently used first.
+
+    If the wrapped evaluator has a generation attribute (InferenceClient),
+    the cache is cleared whenever it changes, i.e. when the network weights
+    behind the evaluator are reloaded.
+    """
+    def __init__(self, evaluator, max_entries=100000, zobrist=None):
+        self.evaluator = evaluator
+        self.max_entries = max_entries
+        self.symmetries = board_symmetries()
+        self.zobrist = zobrist or ZobristTable(self.symmetries.n_cells)
+        self._cache = OrderedDict()
+        self._generation = getattr(evaluator, "generation", None)
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._cache)
+
+    def clear(self):
+        self._cache.clear()
+
+    def __call__(self, observations):
+        generation = getattr(self.evaluator, "generation", None)
+        if generation != self._generation:
+            # New weights: the cached evaluations are stale
+            self.clear()
+            self._generation = generation
+
+        batch = len(observations)
+        codes = observation_codes(observations)
+        n_actions = self.symmetries.n_cells ** 2
+        policy_logits = np.empty((batch, n_actions), dtype=np.float32)
+        values = np.empty(batch, dtype=np.float32)
+
+        canonical = [self.zobrist.canonical_hash(codes[i], symmetries=self.symmetries) for i in range(batch)]
+        missing = []
+        for i, (key, g) in enumerate(canonical):
+            entry = self._cache.get(key)
+            if entry is None:
+                missing.append(i)
+                continue
+            self._cache.move_to_end(key)
+            canonical_logits, value = entry
+            policy_logits[i] = canonical_logits[self.symmetries.action_perm[g]]
+            values[i] = value
+        self.hits += batch - len(missing)
+        self.misses += len(missing)
+
+        if missing:
+            missing_logits, missing_values = self.evaluator(observations[missing])
+            for j, i in enumerate(missing):
+                key, g = canonical[i]
+                policy_logits[i] = missing_logits[j]
+                values[i] = missing_values[j]
+                self._cache[key] = (
+                    np.asarray(missing_logits[j], dtype=np.float32)[self.symmetries.action_gather[g]],
+                    float(missing_values[j]),
+                )
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+
+        return policy_logits, values
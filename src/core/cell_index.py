@@ -0,0 +1,27 @@
+"""
+Cell indexing - canonical, process-independent numbering of the board cells
+
+Cells are numbered in sorted (q, r, s) order, so an index means the same
+cell in every process, whatever the set iteration order of
+Board.complete_hex_board. Observations, flat actions
+(source * N_CELLS + target) and the AI lookup tables all use this order.
+"""
+from src.core.board import Board
+
+# Every cell of the standard board, sorted by cube coordinates
+CELLS = tuple(sorted(Board().complete_hex_board, key=lambda cell: (cell.q, cell.r, cell.s)))
+
+# Hexagon -> index lookup
+CELL_INDEX = {cell: idx for idx, cell in enumerate(CELLS)}
+
+N_CELLS = len(CELLS)
+
+
+def cell_to_index(hex_cell):
+    """Index of a board cell."""
+    return CELL_INDEX[hex_cell]
+
+
+def index_to_cell(idx):
+    """Board cell of an index."""
+    return CELLS[idx]
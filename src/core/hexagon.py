@@ -13,6 +13,8 @@ class Hexagon:
         return f"Hex({self.q}, {self.r}, {self.s})"
 
     def __eq__(self, other):
+        if not isinstance(other, Hexagon):
+            return NotImplemented
         return (self.q, self.r, self.s) == (other.q, other.r, other.s)
 
     def __hash__(self):
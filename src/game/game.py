@@ -1,49 +1,93 @@
 """
 Main game class - Coordinates the game flow and states
 """
-import pygame
 from src.core.board import Board
 from src.core.player import Player
-from src.game.placement_phase import placement_phase
-from src.game.game_phase import game_phase, initialize_preset_configuration
+from src.game.rules import initialize_preset_configuration
 
 class Game:
-    def __init__(self, screen_size=(800, 600)):
-        # Initialize pygame
-        pygame.init()
-        self.screen = pygame.display.set_mode(screen_size)
-        pygame.display.set_caption("Hexagonal Game")
-        self.clock = pygame.time.Clock()
+    def __init__(self, screen_size=(800, 600), players=None, profile_csv=None, record_path=None):
+        # The window is only opened by run(), so a Game can be built headless
+        self.screen_size = screen_size
+        self.screen = None
+        self.clock = None
         
+        # Timing samples of the UI (overlay toggled with F3), written to profile_csv on exit
+        self.profile_csv = profile_csv
+        self.profiler = None
+        
+        # Input events of the session, saved to record_path on exit (see src.ui.replay)
+        self.record_path = record_path
+
         # Game components
         self.board = Board()
-        self.players = [
+        # Players with a choose_move method (see src.ai.ai_player) are played by the computer
+        self.players = players or [
             Player(color="red", name="Player 1"),
             Player(color="blue", name="Player 2")
         ]
-        
+
+    def _init_display(self):
+        """Initialize pygame and open the game window."""
+        import pygame
+
+        pygame.init()
+        # The board view scales with the window (see src.ui.layout)
+        self.screen = pygame.display.set_mode(self.screen_size, pygame.RESIZABLE)
+        pygame.display.set_caption("Hexagonal Game")
+        self.clock = pygame.time.Clock()
+
     def run(self, skip_placement=False):
         """
         Run the complete game flow.
-        
+
         Args:
             skip_placement: If True, skip the placement phase and use a preset configuration
         """
+        import pygame
+        from src.game.placement_phase import placement_phase
+        from src.game.game_phase import game_phase
+        from src.ui.profiler import Profiler
+        from src.ui.rendering import reset_caches
+        from src.ui.replay import EventRecorder
+
+        self._init_display()
+        options = {"profiler": Profiler()}
+        self.profiler = options["profiler"]
+        if self.record_path:
+            options["recorder"] = EventRecorder(self.screen_size, skip_placement)
+
         if skip_placement:
             # Skip placement and use a preset configuration
             initialize_preset_configuration(self.board, self.players[0], self.players[1])
             placement_complete = True
         else:
             # Run the placement phase
-            placement_complete = placement_phase(self.screen, self.board, self.players)
-        
+            placement_complete = placement_phase(self.screen, self.board, self.players, **options)
+
         if placement_complete:
             # Run the main game phase
-            game_complete = game_phase(self.screen, self.board, self.players)
-            
+            # The window may have been resized (and its surface replaced) during placement
+            self.screen = pygame.display.get_surface()
+            game_complete = game_phase(self.screen, self.board, self.players, **options)
+
+        if self.profile_csv:
+            count = self.profiler.export_csv(self.profile_csv)
+            print(f"Wrote {count} timing samples to {self.profile_csv}")
+        if self.record_path:
+            count = options["recorder"].save(self.record_path, self.board)
+            print(f"Recorded {count} input events to {self.record_path}")
+
         # Clean up
+        reset_caches()
         pygame.quit()
-        
+
     def quit(self):
         """Clean up and exit the game."""
-        pygame.quit()
\ No newline at end of file
+        # Nothing to release if the window was never opened
+        if self.screen is not None:
+            import pygame
+            from src.ui.rendering import reset_caches
+
+            reset_caches()
+            pygame.quit()
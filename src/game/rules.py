@@ -0,0 +1,278 @@
+"""
+Game rules - pure functions on the board, shared by the UI phases and headless code
+
+Nothing here imports pygame, so the rules can be used by servers, tests and
+AI workers without a display.
+"""
+from src.core.hexagon import Hexagon
+from src.core.piece import Unit, Double, Triple, Quadruple, Hat
+
+# Preset setup used to skip the placement phase
+PRESET_RED_POSITIONS = [
+    (-1, -1, 2), (4, -1, -3), (3, -3, 0), (2, -4, 2),
+    (2, -1, -1), (2, 2, -4), (1, -2, 1), (1, 1, -2)
+]
+PRESET_BLUE_POSITIONS = [
+    (0, -3, 3), (0, 3, -3), (-1, 2, -1), (-2, -2, 4),
+    (-2, 1, 1), (-3, 0, 3), (-3, 4, -1), (-4, 2, 2)
+]
+
+def is_valid_split_cell(board, hex_cell):
+    """
+    Check if a cell is valid for placing a split unit:
+    - Not a dark cell
+    - Not occupied
+    """
+    if hex_cell in board.forbidden_cells:
+        return False
+    if hex_cell in board.pieces:
+        return False
+    return True
+
+def initialize_preset_configuration(board, player1, player2):
+    """Initialize a predefined setup after the placement phase (for testing)."""
+    # Place red units (Player 1)
+    for pos in PRESET_RED_POSITIONS:
+        board.place_piece(Unit("red", Hexagon(*pos)), Hexagon(*pos))
+
+    # Place blue units (Player 2)
+    for pos in PRESET_BLUE_POSITIONS:
+        board.place_piece(Unit("blue", Hexagon(*pos)), Hexagon(*pos))
+
+    # Place hats at center
+    center = Hexagon(0, 0, 0)
+    red_hat = Hat("red", center)
+    blue_hat = Hat("blue", center)
+    
+    # Store both hats directly in board attributes
+    board.red_hat = red_hat
+    board.blue_hat = blue_hat
+    
+    print("Initialized preset configuration with both hats at center")
+
+def placement_cells(board):
+    """Cells where the next unit can be placed: free, not dark, with no adjacent unit."""
+    return [
+        hex_cell for hex_cell in board.complete_hex_board
+        if hex_cell not in board.pieces
+        and hex_cell not in board.forbidden_cells
+        and not board.is_adjacent(hex_cell)
+    ]
+
+def place_center_hats(board):
+    """Put both hats in the center once the placement phase is over."""
+    center = Hexagon(0, 0, 0)
+    board.red_hat = Hat("red", center)
+    board.blue_hat = Hat("blue", center)
+
+def center_hat(board, color):
+    """The hat of a color still waiting in the center, or None."""
+    return board.red_hat if color == "red" else board.blue_hat
+
+def selectable_piece(board, hex_cell, color):
+    """
+    The piece a player selects by clicking a cell, or None.
+    
+    Quadruples never move. On a champotée cell (piece, hat) only the hat can
+    be selected, by the owner of the hat.
+    """
+    piece = board.pieces.get(hex_cell)
+    if piece is None or isinstance(piece, Quadruple):
+        return None
+    if isinstance(piece, tuple):
+        immobilized_piece, hat = piece
+        if hat.color != color:
+            # Can't select an immobilized piece
+            print(f"This {immobilized_piece.color} piece is immobilized by a {hat.color} hat")
+            return None
+        hat.position = hex_cell  # Ensure position is correct
+        print(f"Selected {color} hat on top of {immobilized_piece.color} piece")
+        piece = hat
+    return piece if piece.color == color else None
+
+def _relocate(board, piece, target_hex):
+    """Move a piece directly, overwriting whatever is on the target."""
+    old_pos = piece.position
+    piece.position = target_hex
+    del board.pieces[old_pos]
+    board.pieces[target_hex] = piece
+
+def _fuse(board, piece, target_hex, piece_type):
+    """Replace a piece and the allied piece on target_hex by a new piece_type stack."""
+    del board.pieces[piece.position]
+    new_piece = piece_type(piece.color, target_hex)
+    board.pieces[target_hex] = new_piece
+    return new_piece
+
+def move_center_hat(board, color, target_hex):
+    """Move a hat out of the center onto target_hex."""
+    if color == "red":
+        hat = board.red_hat
+        board.red_hat = None
+    else:
+        hat = board.blue_hat
+        board.blue_hat = None
+    hat.position = target_hex
+    _land_hat(board, hat, target_hex)
+
+def _land_hat(board, hat, target_hex):
+    # Case A: Destination has a regular piece (create a tuple)
+    if target_hex in board.pieces and not isinstance(board.pieces[target_hex], (Hat, tuple)):
+        existing_piece = board.pieces[target_hex]
+        # Immobilize the piece
+        existing_piece.immobilized = True
+        board.pieces[target_hex] = (existing_piece, hat)
+    # Case B: Destination is empty (just place the hat)
+    elif target_hex not in board.pieces:
+        board.pieces[target_hex] = hat
+    # Case C: Destination has a hat or a tuple (this shouldn't happen with valid moves)
+    else:
+        print("Warning: Attempted to move hat to an invalid destination with another hat or tuple")
+        board.pieces[target_hex] = hat
+
+def move_piece(board, player, piece, target_hex):
+    """
+    Move a Unit, Triple or Hat to one of its possible moves.
+    
+    Returns:
+        (done, follow_up): done is False if the move does not apply and the
+        player must pick another target. follow_up is the piece formed by a
+        fusion that keeps moving this turn, or None.
+    """
+    # Regular move to empty cell
+    if target_hex not in board.pieces:
+        if isinstance(piece, Hat):
+            old_pos = piece.position
+            piece.position = target_hex
+            # Hat was part of a tuple: release the immobilized piece and leave it there
+            if isinstance(board.pieces.get(old_pos), tuple):
+                immobilized_piece, _ = board.pieces[old_pos]
+                immobilized_piece.immobilized = False
+                board.pieces[old_pos] = immobilized_piece
+            # Hat was alone
+            elif old_pos in board.pieces:
+                del board.pieces[old_pos]
+            _land_hat(board, piece, target_hex)
+        else:
+            _relocate(board, piece, target_hex)
+        if hasattr(piece, 'just_formed'):
+            piece.just_formed = False
+        return True, None
+
+    other_piece = board.pieces[target_hex]
+
+    # Enemy piece capture (a hatted piece cannot be captured)
+    if not isinstance(other_piece, tuple) and other_piece.color != piece.color:
+        if isinstance(piece, Double) and isinstance(other_piece, Unit):
+            print(f"Double {piece.color} captures enemy Unit {other_piece.color}")
+            _relocate(board, piece, target_hex)
+            return True, None
+        if isinstance(piece, Triple) and isinstance(other_piece, Double):
+            print(f"Triple {piece.color} captures enemy Double {other_piece.color}")
+            _relocate(board, piece, target_hex)
+            return True, None
+
+    # Unit fusions (not with a hatted piece)
+    if isinstance(piece, Unit) and not isinstance(other_piece, tuple):
+        if isinstance(other_piece, Unit) and piece.color == other_piece.color:
+            # Unit + Unit -> Double, which keeps moving
+            new_piece = _fuse(board, piece, target_hex, Double)
+            new_piece.just_formed = True
+            return True, new_piece
+        if isinstance(other_piece, Double) and piece.color == other_piece.color:
+            # Unit + Double -> Triple, which keeps moving
+            new_piece = _fuse(board, piece, target_hex, Triple)
+            new_piece.just_formed = True
+            return True, new_piece
+
+    # A hat immobilizes the piece it lands on
+    elif isinstance(piece, Hat):
+        if not isinstance(other_piece, Hat):
+            other_piece.immobilized = True
+        player.move_piece(piece.position, target_hex, board)
+        return True, None
+
+    return False, None
+
+def move_double(board, player, piece, target_hex):
+    """
+    Move a Double chosen with the Move button.
+    
+    Returns:
+        (done, follow_up) as for move_piece
+    """
+    if target_hex == piece.position:
+        print("Cannot move to the same position.")
+        return False, None
+
+    # Simple move
+    if target_hex not in board.pieces:
+        player.move_piece(piece.position, target_hex, board)
+        piece.just_formed = False
+        return True, None
+
+    other_piece = board.pieces[target_hex]
+    if isinstance(other_piece, tuple):
+        return False, None
+
+    if other_piece.color != piece.color:
+        # Double can capture Unit
+        if isinstance(other_piece, Unit):
+            print(f"Double {piece.color} captures enemy Unit {other_piece.color}")
+            _relocate(board, piece, target_hex)
+            piece.just_formed = False
+            return True, None
+        return False, None
+
+    if isinstance(other_piece, Unit):
+        # Double + Unit -> Triple, which keeps moving
+        new_piece = _fuse(board, piece, target_hex, Triple)
+        new_piece.just_formed = True
+        return True, new_piece
+    if isinstance(other_piece, Double):
+        # Double + Double -> Quadruple
+        _fuse(board, piece, target_hex, Quadruple)
+        return True, None
+    return False, None
+
+def continue_move(board, piece, target_hex):
+    """
+    Second move of a piece formed by a fusion this turn.
+    
+    A new Double can fuse again (into a Triple that keeps moving, or a
+    Quadruple) or move; a new Triple simply moves.
+    
+    Returns:
+        (done, follow_up) as for move_piece
+    """
+    if target_hex == piece.position:
+        return False, None
+
+    if isinstance(piece, Double) and target_hex in board.pieces:
+        other_piece = board.pieces[target_hex]
+        if isinstance(other_piece, Unit) and other_piece.color == piece.color:
+            # Double + Unit -> Triple
+            new_piece = _fuse(board, piece, target_hex, Triple)
+            new_piece.just_formed = True
+            return True, new_piece
+        if isinstance(other_piece, Double) and other_piece.color == piece.color:
+            # Double + Double -> Quadruple
+            _fuse(board, piece, target_hex, Quadruple)
+            return True, None
+        return False, None
+
+    _relocate(board, piece, target_hex)
+    return True, None
+
+def split_flower(board, hex_cell, used_flowers):
+    """
+    Flower that a split unit placed on hex_cell would use, or None.
+    
+    Each unit of a split must be in a different flower, and the central
+    flower (0,0,0) is excluded.
+    """
+    center = Hexagon(0, 0, 0)
+    for flower_center in board.possible_flowers(hex_cell):
+        if flower_center != center and flower_center not in used_flowers:
+            return flower_center
+    return None
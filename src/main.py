@@ -2,17 +2,47 @@
 Main entry point for the hexagonal game
 """
 import argparse
+from src.core.player import Player
 from src.game.game import Game
 
+def make_players(ai, ai_color, model=None, simulations=200):
+    """Human players, except the ai_color one when an AI is requested."""
+    players = [Player(color="red", name="Player 1"), Player(color="blue", name="Player 2")]
+    if ai == "none":
+        return players
+    
+    from src.ai.ai_player import MCTSPlayer, RandomPlayer, RLPlayer
+    if ai == "random":
+        ai_player = RandomPlayer(ai_color)
+    elif ai == "rl":
+        ai_player = RLPlayer(ai_color, model)
+    else:
+        ai_player = MCTSPlayer(ai_color, n_simulations=simulations)
+    players[0 if ai_color == "red" else 1] = ai_player
+    return players
+
 def main():
     """Parse arguments and start the game."""
     parser = argparse.ArgumentParser(description="Hexagonal Board Game")
     parser.add_argument("--skip-placement", action="store_true", 
                        help="Skip the placement phase and use a preset configuration")
+    parser.add_argument("--ai", choices=["none", "random", "rl", "mcts"], default="none",
+                       help="Computer opponent for the game phase")
+    parser.add_argument("--ai-color", choices=["red", "blue"], default="blue",
+                       help="Color played by the computer")
+    parser.add_argument("--model", default="ppo_hex_game.npz",
+                       help="Policy file for --ai rl")
+    parser.add_argument("--simulations", type=int, default=200,
+                       help="Simulations per move for --ai mcts")
+    parser.add_argument("--profile-csv", default=None,
+                       help="Write UI frame/render/move-generation/click timings to this CSV on exit (overlay: F3)")
+    parser.add_argument("--record", default=None,
+                       help="Record the input events of the session to this file (replay: python -m src.ui.replay)")
     args = parser.parse_args()
     
     # Create and run the game
-    game = Game()
+    game = Game(players=make_players(args.ai, args.ai_color, args.model, args.simulations),
+                profile_csv=args.profile_csv, record_path=args.record)
     try:
         game.run(skip_placement=args.skip_placement)
     except KeyboardInterrupt:
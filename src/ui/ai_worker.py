@@ -0,0 +1,107 @@
+"""
+Background AI move selection for the pygame client
+
+AIWorker runs a player's choose_move on a copy of the board in a worker
+thread, so the event loop keeps rendering while the engine searches. The
+worker wakes the event loop with pygame events: AI_PROGRESS when new search
+stats are available (at most every PROGRESS_INTERVAL seconds) and AI_DONE
+when the move is ready. pygame.event.post is thread-safe.
+"""
+import copy
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pygame
+
+AI_PROGRESS = pygame.event.custom_type()
+AI_DONE = pygame.event.custom_type()
+
+# Shortest delay between two AI_PROGRESS events, in seconds
+PROGRESS_INTERVAL = 0.1
+
+
+def is_ai_player(player):
+    """Players able to pick a (source, target) move on their own."""
+    return callable(getattr(player, "choose_move", None))
+
+
+class AIWorker:
+    """
+    Runs one AI move selection at a time in a background thread.
+    """
+    def __init__(self):
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ai-worker")
+        self.future = None
+        self.player = None
+        self.stats = None
+        self._stop = None
+        self._lock = threading.Lock()
+        self._last_post = 0.0
+
+    @property
+    def busy(self):
+        return self.future is not None and not self.future.done()
+
+    def start(self, player, board):
+        """Start choosing a move for player. The board is copied, so the UI can keep using it."""
+        self.cancel()
+        self.player = player
+        self.stats = None
+        self._stop = threading.Event()
+        self.future = self.executor.submit(player.choose_move, copy.deepcopy(board),
+                                           progress=self._report, stop=self._stop)
+        self.future.add_done_callback(self._done)
+        return self.future
+
+    def latest_stats(self):
+        """Most recent stats dict reported by the engine, or None."""
+        with self._lock:
+            return self.stats
+
+    def result(self):
+        """
+        Move chosen by the engine.
+
+        Returns:
+            (source_hex, target_hex), or None if there is no move, the search
+            was cancelled or the engine failed
+        """
+        if self.future is None or not self.future.done() or self.future.cancelled():
+            return None
+        error = self.future.exception()
+        if error is not None:
+            print(f"AI move selection failed: {error!r}")
+            return None
+        return self.future.result()
+
+    def cancel(self):
+        """Stop the running search, if any. Its result is discarded."""
+        if self.future is not None:
+            self._stop.set()
+            self.future.cancel()
+            self.future = None
+
+    def shutdown(self):
+        self.cancel()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def _report(self, stats):
+        # Called from the worker thread
+        with self._lock:
+            self.stats = stats
+        now = time.monotonic()
+        if now - self._last_post >= PROGRESS_INTERVAL:
+            self._last_post = now
+            _post(AI_PROGRESS)
+
+    def _done(self, future):
+        # Called from the worker thread (or the caller if already done)
+        if not future.cancelled():
+            _post(AI_DONE, future=future)
+
+
+def _post(event_type, **attributes):
+    # The display may already be closed when a cancelled search finishes
+    if pygame.display.get_init():
+        pygame.event.post(pygame.event.Event(event_type, **attributes))
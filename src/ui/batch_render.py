@@ -0,0 +1,294 @@
+"""
+Headless batch rendering of recorded games
+
+Renders games off-screen with render_board under the SDL dummy video
+driver, one game per task on a process pool. Each worker opens its dummy
+display once, so the static board layer of the renderer is built once per
+worker and every frame only repaints the cells that changed.
+
+A game file is an .npz holding either
+    observations: (n_positions, N_CELLS, 10) one-hot boards, as written in
+        self-play shards (hats are not part of observations). A shard holds
+        many games: they are split on its game_lengths, and the colours are
+        restored from its players (observations are seen from the player to
+        move). Shards without game_lengths are rendered as a single game.
+    actions: flat actions (source_idx * N_CELLS + target_idx) replayed from
+        the HexGameEnv start position, one game per file.
+
+Each game gets its own frame directory or contact sheet. Contact sheets
+hold at most max_thumbnails evenly spaced positions of a game, so their
+size stays bounded whatever the game length.
+
+The cell centres and polygons of the frames (see src.ui.geometry) are
+written to geometry.npz in the output directory, so the images can be
+annotated or cropped per cell offline.
+
+Run with:
+    python -m src.ui.batch_render selfplay_data/*.npz --output-dir renders --contact-sheet
+"""
+import argparse
+import math
+import multiprocessing as mp
+import os
+import shutil
+import subprocess
+
+import numpy as np
+
+from src.ai.encoding import BLUE_START_POSITIONS, RED_START_POSITIONS, legal_targets, mover_observation
+from src.core.board import Board
+from src.core.cell_index import CELLS, N_CELLS
+from src.core.hexagon import Hexagon
+from src.core.piece import Unit, Double, Triple, Quadruple
+from src.core.player import Player
+
+# Piece of each observation channel (see src.ai.encoding.PIECE_CHANNELS)
+CHANNEL_PIECES = {
+    1: (Unit, "red"), 2: (Double, "red"), 3: (Triple, "red"), 4: (Quadruple, "red"),
+    5: (Unit, "blue"), 6: (Double, "blue"), 7: (Triple, "blue"), 8: (Quadruple, "blue"),
+}
+
+SCREEN_SIZE = (800, 600)
+
+# Most thumbnails on one contact sheet; longer games are sampled evenly
+MAX_THUMBNAILS = 64
+
+# Set in each worker by _init_worker
+_screen = None
+
+
+def board_from_observation(observation):
+    """Rebuild a board from a one-hot observation."""
+    board = Board()
+    channels = np.asarray(observation).argmax(axis=1)
+    for idx, channel in enumerate(channels):
+        if int(channel) in CHANNEL_PIECES:
+            piece_type, color = CHANNEL_PIECES[int(channel)]
+            board.pieces[CELLS[idx]] = piece_type(color, CELLS[idx])
+    return board
+
+
+def replay_actions(actions):
+    """
+    Yield the board after every move of a game recorded as flat actions.
+
+    Moves are applied as HexGameEnv.step does; invalid moves leave the board
+    unchanged and do not pass the turn.
+    """
+    board = Board()
+    for pos in RED_START_POSITIONS:
+        board.place_piece(Unit("red", Hexagon(*pos)), Hexagon(*pos))
+    for pos in BLUE_START_POSITIONS:
+        board.place_piece(Unit("blue", Hexagon(*pos)), Hexagon(*pos))
+    players = [Player(color="red"), Player(color="blue")]
+    current = 0
+
+    yield board
+    for action in actions:
+        source_hex, target_hex = CELLS[int(action) // N_CELLS], CELLS[int(action) % N_CELLS]
+        piece = board.pieces.get(source_hex)
+        if (piece is not None and not isinstance(piece, tuple) and piece.color == players[current].color
+                and target_hex in legal_targets(board, piece)):
+            players[current].move_piece(source_hex, target_hex, board)
+            current = 1 - current
+        yield board
+
+
+def observation_boards(observations, players=None):
+    """
+    Yield the board of every observation of a game.
+
+    Args:
+        observations: One-hot observations, in order
+        players: Index of the player to move at each position, if the
+            observations are seen from that player (self-play shards)
+    """
+    for i, observation in enumerate(observations):
+        if players is not None:
+            observation = mover_observation(observation, int(players[i]))
+        yield board_from_observation(observation)
+
+
+def load_games(path):
+    """
+    Games of a game file.
+
+    Returns:
+        List of (n_positions, boards) pairs, boards yielding the board after every move
+    """
+    with np.load(path) as data:
+        if "actions" in data:
+            actions = data["actions"]
+            return [(len(actions) + 1, replay_actions(actions))]
+        observations = data["observations"]
+        players = data["players"] if "players" in data else None
+        game_lengths = data["game_lengths"] if "game_lengths" in data else [len(observations)]
+
+    games = []
+    start = 0
+    for length in game_lengths:
+        end = start + int(length)
+        game_players = players[start:end] if players is not None else None
+        games.append((end - start, observation_boards(observations[start:end], game_players)))
+        start = end
+    return games
+
+
+def _init_worker():
+    """Open a dummy display once per worker process."""
+    global _screen
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    # Keep the default SIGTERM behaviour so Pool.terminate() can stop the worker
+    os.environ["SDL_NO_SIGNAL_HANDLERS"] = "1"
+    import pygame
+
+    pygame.display.init()
+    pygame.font.init()
+    _screen = pygame.display.set_mode(SCREEN_SIZE)
+
+
+def render_game(path, output_dir, contact_sheet=False, columns=8, thumb_width=200,
+                max_thumbnails=MAX_THUMBNAILS, video_fps=None):
+    """
+    Render every game of a game file.
+
+    Args:
+        path: Game .npz file
+        output_dir: Directory receiving a sub-directory of frames or a contact sheet per game
+        contact_sheet: Write one grid image per game instead of one PNG per position
+        columns: Thumbnails per row of the contact sheet
+        thumb_width: Width of a contact sheet thumbnail in pixels
+        max_thumbnails: Most positions shown on a contact sheet (sampled evenly)
+        video_fps: If set, also encode the frames to an .mp4 with ffmpeg
+
+    Returns:
+        (path, number of frames, list of written files)
+    """
+    import pygame
+    from src.ui.layout import BoardLayout
+    from src.ui.rendering import invalidate, present, render_board
+
+    os.makedirs(output_dir, exist_ok=True)
+    name = os.path.splitext(os.path.basename(path))[0]
+    games = load_games(path)
+    thumb_size = (thumb_width, thumb_width * SCREEN_SIZE[1] // SCREEN_SIZE[0])
+    layout = BoardLayout(_screen.get_size())
+    written = []
+    n_frames = 0
+
+    for game_index, (n_positions, boards) in enumerate(games):
+        game_name = name if len(games) == 1 else f"{name}-game{game_index:04d}"
+        frame_dir = os.path.join(output_dir, game_name)
+        shown = set(np.linspace(0, n_positions - 1, min(n_positions, max_thumbnails)).round().astype(int).tolist())
+        thumbs = []
+
+        # A new game starts from a full repaint over the cached static layer
+        invalidate()
+        for position, board in enumerate(boards):
+            if contact_sheet and position not in shown:
+                continue
+            render_board(_screen, board, layout.size, origin=layout.origin)
+            present()
+            if contact_sheet:
+                thumbs.append(pygame.transform.smoothscale(_screen, thumb_size))
+            else:
+                os.makedirs(frame_dir, exist_ok=True)
+                frame_path = os.path.join(frame_dir, f"frame_{position:04d}.png")
+                pygame.image.save(_screen, frame_path)
+                written.append(frame_path)
+            n_frames += 1
+
+        if contact_sheet and thumbs:
+            rows = math.ceil(len(thumbs) / columns)
+            sheet = pygame.Surface((min(columns, len(thumbs)) * thumb_size[0], rows * thumb_size[1]))
+            sheet.fill((255, 255, 255))
+            for i, thumb in enumerate(thumbs):
+                sheet.blit(thumb, ((i % columns) * thumb_size[0], (i // columns) * thumb_size[1]))
+            sheet_path = os.path.join(output_dir, f"{game_name}.png")
+            pygame.image.save(sheet, sheet_path)
+            written.append(sheet_path)
+
+        if video_fps and not contact_sheet and n_positions:
+            video_path = os.path.join(output_dir, f"{game_name}.mp4")
+            subprocess.run(
+                ["ffmpeg", "-loglevel", "error", "-y", "-framerate", str(video_fps),
+                 "-i", os.path.join(frame_dir, "frame_%04d.png"), "-pix_fmt", "yuv420p", video_path],
+                check=True,
+            )
+            written.append(video_path)
+
+    return path, n_frames, written
+
+
+def write_geometry(path, screen_size=SCREEN_SIZE):
+    """Save the cell geometry table of the rendered frames."""
+    from src.ui.layout import BoardLayout
+
+    geometry = BoardLayout(screen_size).geometry
+    np.savez(path, cells=np.array([(cell.q, cell.r, cell.s) for cell in CELLS]),
+             centers=geometry.centers, vertices=geometry.vertices, rects=geometry.rects)
+
+
+def _render_task(args):
+    path, output_dir, options = args
+    return render_game(path, output_dir, **options)
+
+
+def render_games(paths, output_dir, n_workers=None, **options):
+    """
+    Render many game files on a process pool.
+
+    Args:
+        paths: Game .npz files
+        output_dir: Output directory
+        n_workers: Number of worker processes (default: CPU count)
+        **options: Passed to render_game
+
+    Returns:
+        Total number of frames rendered
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    write_geometry(os.path.join(output_dir, "geometry.npz"))
+    n_workers = n_workers or os.cpu_count() or 1
+    tasks = [(path, output_dir, options) for path in paths]
+
+    # Workers never share the parent's pygame state
+    ctx = mp.get_context("spawn")
+    total_frames = 0
+    with ctx.Pool(n_workers, initializer=_init_worker) as pool:
+        for path, n_frames, _written in pool.imap_unordered(_render_task, tasks):
+            total_frames += n_frames
+            print(f"{path}: {n_frames} frames")
+    return total_frames
+
+
+def main():
+    """Parse arguments and render the games."""
+    parser = argparse.ArgumentParser(description="Render recorded games to images without a display")
+    parser.add_argument("games", nargs="+", help="Game .npz files (actions or observations)")
+    parser.add_argument("--output-dir", default="renders", help="Directory for the images")
+    parser.add_argument("--workers", type=int, default=None, help="Number of worker processes (default: CPU count)")
+    parser.add_argument("--contact-sheet", action="store_true", help="One grid image per game instead of PNG frames")
+    parser.add_argument("--columns", type=int, default=8, help="Thumbnails per contact sheet row")
+    parser.add_argument("--thumb-width", type=int, default=200, help="Contact sheet thumbnail width")
+    parser.add_argument("--max-thumbnails", type=int, default=MAX_THUMBNAILS,
+                        help="Most positions per contact sheet (longer games are sampled evenly)")
+    parser.add_argument("--video", type=int, default=None, metavar="FPS",
+                        help="Also encode the frames of each game to .mp4 with ffmpeg")
+    args = parser.parse_args()
+
+    if args.video and shutil.which("ffmpeg") is None:
+        parser.error("--video needs ffmpeg on the PATH")
+    if args.video and args.contact_sheet:
+        parser.error("--video needs PNG frames, not --contact-sheet")
+
+    total_frames = render_games(
+        args.games, args.output_dir, n_workers=args.workers,
+        contact_sheet=args.contact_sheet, columns=args.columns,
+        thumb_width=args.thumb_width, max_thumbnails=args.max_thumbnails, video_fps=args.video,
+    )
+    print(f"Rendered {total_frames} frames from {len(args.games)} games to {args.output_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,401 @@
+"""
+Event-driven game controller
+
+The controller blocks on pygame.event.wait instead of polling the event
+queue, and keeps the progress of a turn in an explicit state (placement,
+piece selection, Move/Split choice, target choice, second move after a
+fusion, split placement). The board is only redrawn after a state change
+or when the cell under the mouse changes; the rules applied on each click
+live in src.game.rules. Hex size and origin come from a BoardLayout of
+the window; clicks and hover are resolved with its hit-test map, and all
+cached geometry is rebuilt only when the window is resized.
+
+Players with a choose_move method are played by the computer: their move is
+chosen by an AIWorker in a background thread while the board, a thinking
+indicator and the search stats keep being drawn.
+
+Frame, render_board, possible_moves and click-to-highlight times are
+recorded by a Profiler, whose overlay is toggled with F3. Input events can
+be recorded, and a recorded session replayed by passing its events instead
+of reading the event queue (see src.ui.replay).
+"""
+import pygame
+
+from src.core.hexagon import Hexagon
+from src.core.piece import Unit, Double
+from src.game.rules import (
+    placement_cells, place_center_hats, center_hat, selectable_piece,
+    move_center_hat, move_piece, move_double, continue_move,
+    is_valid_split_cell, split_flower,
+)
+from src.ui.ai_worker import AI_DONE, AI_PROGRESS, AIWorker, is_ai_player
+from src.ui.layout import BoardLayout
+from src.ui.profiler import FRAME, POSSIBLE_MOVES, RENDER_BOARD, TOGGLE_KEY, Profiler
+from src.ui.rendering import render_board, draw_button, draw_text, invalidate, present
+
+# Controller states
+PLACEMENT = "placement"              # Placing the initial units
+SELECT = "select"                    # Choosing a piece to play
+CHOOSE_ACTION = "choose_action"      # Double selected: Move or Split
+MOVE = "move"                        # Choosing the target of a Unit, Triple or Hat
+MOVE_DOUBLE = "move_double"          # Choosing the target of a Double
+MOVE_CENTER_HAT = "move_center_hat"  # Choosing where a hat leaves the center
+CONTINUE = "continue"                # Second move of a piece formed by a fusion
+SPLIT = "split"                      # Placing the 3 units of a split Double
+AI_THINKING = "ai_thinking"          # Waiting for a computer player's move
+FINISHED = "finished"                # Phase over
+
+# Button areas (x, y, width, height) for move/split; turned into pygame.Rect on use
+MOVE_BUTTON = (20, 50, 100, 40)
+SPLIT_BUTTON = (130, 50, 100, 40)
+
+# Longest time spent blocked waiting for an event, in milliseconds
+WAIT_TIMEOUT = 500
+
+
+class GameController:
+    """
+    Drives the placement and game phases from pygame events.
+    """
+    def __init__(self, screen, board, players, layout=None, profiler=None, recorder=None, events=None):
+        """
+        Args:
+            screen: Pygame screen to draw on
+            board: Game board
+            players: [red player, blue player]
+            layout: BoardLayout (default: computed from the screen size)
+            profiler: Profiler receiving the timings (default: a new one)
+            recorder: Optional EventRecorder receiving every input event
+            events: Optional iterator of events read instead of the event queue;
+                the phase ends as if the window was closed once it is exhausted
+        """
+        self.screen = screen
+        self.board = board
+        self.players = players
+        self.layout = layout or BoardLayout(screen.get_size())
+
+        self.player_index = 0  # Current player index
+        self.state = None
+        self.piece = None      # Piece being moved
+        self.targets = []      # Highlighted cells the current click can go to
+        self.hover = None      # Cell under the mouse
+        self.dirty = True      # The screen must be redrawn
+        self.ai_worker = None
+        self.thinking_since = 0
+        self.profiler = profiler or Profiler()
+        self.recorder = recorder
+        self.events = events
+
+        # Split progress
+        self.split_color = None
+        self.used_flowers = set()
+        self.blocked_cells = set()
+        self.units_to_place = 0
+
+    @property
+    def player(self):
+        return self.players[self.player_index]
+
+    def run_placement(self):
+        """Run the placement phase. Returns False if the window was closed."""
+        self.player_index = 0
+        self._start_placement_turn()
+        return self.run()
+
+    def run_game(self):
+        """Run the main game phase. Returns False if the window was closed."""
+        self.player_index = 0
+        self._start_turn()
+        return self.run()
+
+    def run(self):
+        """Process events until the phase is over (True) or the window is closed (False)."""
+        try:
+            while self.state != FINISHED:
+                if self.dirty:
+                    with self.profiler.measure(FRAME):
+                        self.draw()
+                    self.profiler.frame_drawn()
+                    self.dirty = False
+
+                event = self._next_event()
+                if self.recorder is not None:
+                    self.recorder.record(event)
+                if event.type == pygame.QUIT:
+                    return False
+                self.handle_event(event)
+            return True
+        finally:
+            if self.ai_worker is not None:
+                # Abandon a running search
+                self.ai_worker.shutdown()
+                self.ai_worker = None
+
+    def _next_event(self):
+        if self.events is not None:
+            # Replay: no waiting at all
+            event = next(self.events, None)
+            return pygame.event.Event(pygame.QUIT) if event is None else event
+        # Sleep until something happens instead of spinning at a fixed frame rate
+        return pygame.event.wait(WAIT_TIMEOUT)
+
+    def handle_event(self, event):
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:  # Left click
+            self.profiler.click()
+            self.handle_click(event.pos)
+            if not self.dirty:
+                # Ignored click: nothing to measure
+                self.profiler.cancel_click()
+        elif event.type == pygame.KEYDOWN and event.key == TOGGLE_KEY:
+            self.profiler.toggle()
+            self.dirty = True
+        elif event.type == pygame.MOUSEMOTION:
+            hover = self.cell_at(event.pos)
+            if hover != self.hover:
+                self.hover = hover
+                self.dirty = True
+        elif event.type == AI_PROGRESS and self.state == AI_THINKING:
+            self.dirty = True
+        elif event.type == AI_DONE and self.state == AI_THINKING and event.future is self.ai_worker.future:
+            self._play_ai_move(self.ai_worker.result())
+        elif event.type == pygame.NOEVENT and self.state == AI_THINKING:
+            # Wait timeout: keep the thinking indicator moving
+            self.dirty = True
+        elif event.type == pygame.VIDEORESIZE:
+            self.resize(event.size)
+        elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+            # The window content was lost: repaint everything
+            invalidate()
+            self.dirty = True
+
+    def cell_at(self, pos):
+        """Board cell under a screen position, or None outside the board."""
+        return self.layout.cell_at(pos)
+
+    def resize(self, screen_size):
+        """Follow a window resize: new layout, full repaint."""
+        self.screen = pygame.display.get_surface() or self.screen
+        if self.layout.resize(screen_size):
+            invalidate()
+            self.dirty = True
+
+    def handle_click(self, pos):
+        handler = {
+            PLACEMENT: self._click_placement,
+            SELECT: self._click_select,
+            CHOOSE_ACTION: self._click_choose_action,
+            MOVE: self._click_move,
+            MOVE_DOUBLE: self._click_move,
+            MOVE_CENTER_HAT: self._click_move,
+            CONTINUE: self._click_move,
+            SPLIT: self._click_split,
+        }.get(self.state)
+        if handler is not None:
+            handler(pos)
+
+    def draw(self):
+        """Draw the board, the prompts of the current state and the profiler overlay."""
+        self._draw_state()
+        if self.profiler.visible:
+            self.profiler.draw(self.screen)
+        # One display update per frame, with every overlay already drawn
+        present()
+
+    def _draw_state(self):
+        if self.state == SPLIT:
+            with self.profiler.measure(RENDER_BOARD):
+                render_board(self.screen, self.board, self.layout.size, blocked=self.blocked_cells,
+                             hover=self.hover, origin=self.layout.origin)
+            draw_text(self.screen, f"Place unit #{4 - self.units_to_place} (color {self.split_color})", (10, 10))
+            return
+
+        with self.profiler.measure(RENDER_BOARD):
+            render_board(self.screen, self.board, self.layout.size, highlighted=self.targets,
+                         hover=self.hover, origin=self.layout.origin)
+        if self.state == PLACEMENT:
+            draw_text(self.screen, f"{self.player.name}'s turn ({self.player.color})", (10, 10))
+        elif self.state == CHOOSE_ACTION:
+            # All doubles can be split
+            draw_button(self.screen, MOVE_BUTTON, "Move")
+            draw_button(self.screen, SPLIT_BUTTON, "Split")
+        elif self.state == AI_THINKING:
+            self._draw_thinking()
+
+    def _draw_thinking(self):
+        """Thinking indicator and the latest search stats of the engine."""
+        dots = "." * (1 + (pygame.time.get_ticks() - self.thinking_since) // WAIT_TIMEOUT % 3)
+        draw_text(self.screen, f"{self.player.name} is thinking{dots}", (10, 10))
+
+        stats = self.ai_worker.latest_stats()
+        if stats:
+            line = f"depth {stats['depth']}  {stats['nodes_per_sec']:.0f} nodes/s"
+            best_move = stats.get("best_move")
+            if best_move:
+                source, target = best_move
+                line += f"  best ({source.q},{source.r},{source.s})->({target.q},{target.r},{target.s})"
+            draw_text(self.screen, line, (10, 40), font_size=24)
+
+    def _set_state(self, state, piece=None, targets=()):
+        self.state = state
+        self.piece = piece
+        self.targets = list(targets)
+        self.dirty = True
+
+    def _possible_moves(self, piece):
+        with self.profiler.measure(POSSIBLE_MOVES):
+            return piece.possible_moves(self.board)
+
+    def _end_turn(self):
+        self.player_index = 1 - self.player_index  # Switch players
+        self._start_turn()
+
+    def _start_turn(self):
+        if not is_ai_player(self.player):
+            self._set_state(SELECT)
+            return
+        # The engine searches in the background; clicks are ignored meanwhile
+        if self.ai_worker is None:
+            self.ai_worker = AIWorker()
+        self.ai_worker.start(self.player, self.board)
+        self.thinking_since = pygame.time.get_ticks()
+        self._set_state(AI_THINKING)
+
+    # Placement phase
+
+    def _start_placement_turn(self):
+        available_cells = placement_cells(self.board)
+        if not available_cells:
+            # Place the hats in the center after placement phase
+            place_center_hats(self.board)
+            print("Placement phase complete, added hats at center")
+            self._set_state(FINISHED)
+        else:
+            self._set_state(PLACEMENT, targets=available_cells)
+
+    def _click_placement(self, pos):
+        clicked_hex = self.cell_at(pos)
+        if clicked_hex in self.targets and self.player.place_piece(Unit, clicked_hex, self.board):
+            self.player_index = 1 - self.player_index  # Alternate between players
+            self._start_placement_turn()
+
+    # Game phase
+
+    def _click_select(self, pos):
+        clicked_hex = self.cell_at(pos)
+
+        # Special case for clicking the center with hats
+        if clicked_hex == Hexagon(0, 0, 0):
+            hat = center_hat(self.board, self.player.color)
+            if hat:
+                self._set_state(MOVE_CENTER_HAT, hat, self._possible_moves(hat))
+                return
+
+        piece = selectable_piece(self.board, clicked_hex, self.player.color)
+        if piece is None:
+            return
+        if isinstance(piece, Double):
+            self._set_state(CHOOSE_ACTION, piece)
+        else:
+            self._set_state(MOVE, piece, self._possible_moves(piece))
+
+    def _click_choose_action(self, pos):
+        if pygame.Rect(MOVE_BUTTON).collidepoint(pos):
+            self._set_state(MOVE_DOUBLE, self.piece, self._possible_moves(self.piece))
+        elif pygame.Rect(SPLIT_BUTTON).collidepoint(pos):
+            self._start_split(self.piece)
+
+    def _click_move(self, pos):
+        target_hex = self.cell_at(pos)
+        if target_hex not in self.targets:
+            return
+
+        if self.state == MOVE_CENTER_HAT:
+            move_center_hat(self.board, self.player.color, target_hex)
+            self._end_turn()
+            return
+
+        if self.state == MOVE_DOUBLE:
+            done, follow_up = move_double(self.board, self.player, self.piece, target_hex)
+        elif self.state == CONTINUE:
+            done, follow_up = continue_move(self.board, self.piece, target_hex)
+        else:
+            done, follow_up = move_piece(self.board, self.player, self.piece, target_hex)
+
+        if not done:
+            return
+        if follow_up is not None:
+            # A piece formed by a fusion keeps moving this turn
+            self._set_state(CONTINUE, follow_up, self._possible_moves(follow_up))
+        else:
+            self._end_turn()
+
+    def _play_ai_move(self, move):
+        """Apply the (source, target) move chosen by a computer player."""
+        if move is None:
+            print(f"{self.player.name} has no move")
+            self._end_turn()
+            return
+
+        source_hex, target_hex = move
+        color = self.player.color
+        if source_hex == Hexagon(0, 0, 0) and center_hat(self.board, color):
+            move_center_hat(self.board, color, target_hex)
+            self._end_turn()
+            return
+
+        piece = selectable_piece(self.board, source_hex, color)
+        if piece is None:
+            print(f"{self.player.name} chose an invalid move {source_hex} -> {target_hex}")
+            self._end_turn()
+            return
+
+        # Pieces formed by a fusion stay where they are: one move per AI turn
+        if isinstance(piece, Double):
+            done, _follow_up = move_double(self.board, self.player, piece, target_hex)
+        else:
+            done, _follow_up = move_piece(self.board, self.player, piece, target_hex)
+        if not done:
+            print(f"{self.player.name} chose a move the rules rejected {source_hex} -> {target_hex}")
+        self._end_turn()
+
+    # Split: Double -> 3 Units, each in a different flower (not the central one)
+
+    def _start_split(self, double_piece):
+        # Remove the Double
+        del self.board.pieces[double_piece.position]
+        self.split_color = double_piece.color
+        self.used_flowers = set()
+        self.blocked_cells = set()
+        self.units_to_place = 3
+        self._set_state(SPLIT)
+
+    def _click_split(self, pos):
+        clicked_hex = self.cell_at(pos)
+        if clicked_hex is None:
+            return
+
+        # Check if cell is blocked
+        if clicked_hex in self.blocked_cells:
+            print("This cell is already blocked (flower already used).")
+            return
+        if not is_valid_split_cell(self.board, clicked_hex):
+            print("Invalid cell (dark/occupied).")
+            return
+
+        chosen_flower = split_flower(self.board, clicked_hex, self.used_flowers)
+        if chosen_flower is None:
+            print("Impossible: this cell is either outside a flower or in a flower already used.")
+            return
+
+        # Mark this flower as "used" and block all its cells
+        self.used_flowers.add(chosen_flower)
+        self.blocked_cells |= {chosen_flower} | chosen_flower.neighbors(self.board)
+
+        # Place the unit
+        self.board.pieces[clicked_hex] = Unit(self.split_color, clicked_hex)
+        self.units_to_place -= 1
+        self.dirty = True
+
+        if self.units_to_place == 0:
+            print("==> Split complete: Double replaced by 3 Units (distinct flowers).")
+            self._end_turn()
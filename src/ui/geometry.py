@@ -0,0 +1,74 @@
+"""
+Hex geometry table - pixel centre and polygon of every cell
+
+HexGeometry holds, for one hex size and origin, NumPy arrays indexed by cell
+index (src.core.cell_index order):
+    centers: (N_CELLS, 2) pixel centre of each cell
+    vertices: (N_CELLS, 6, 2) polygon corners, at 0, 60, ..., 300 degrees
+    rects: (N_CELLS, 4) integer bounding rect (left, top, width, height)
+
+It is computed once per layout and shared by the renderer, the hit-test map
+and the export tools, which read rows or slices of it instead of recomputing
+the coordinates of each cell. The values are the same floats as the per-cell
+formulas they replace, so the drawn pixels do not change.
+"""
+import functools
+import math
+
+import numpy as np
+
+from src.core.cell_index import CELLS
+
+# Unit corner offsets, computed like the former per-cell polygon code
+_CORNERS = np.array([
+    (math.cos(math.radians(angle)), math.sin(math.radians(angle)))
+    for angle in range(0, 360, 60)
+])
+
+_Q = np.array([cell.q for cell in CELLS], dtype=np.float64)
+_R = np.array([cell.r for cell in CELLS], dtype=np.float64)
+
+
+class HexGeometry:
+    """
+    Pixel geometry of every board cell for one hex size and origin.
+    """
+    def __init__(self, size, origin=(400, 300)):
+        """
+        Args:
+            size: Size of hexagons
+            origin: Pixel position of the center cell
+        """
+        self.size = size
+        self.origin = tuple(origin)
+
+        # Board.hex_to_pixel, offset by the origin, for all cells at once
+        x = size * (3 / 2 * _Q) + self.origin[0]
+        y = size * (math.sqrt(3) * (_R + _Q / 2)) + self.origin[1]
+        self.centers = np.stack([x, y], axis=1)
+        self.vertices = self.centers[:, np.newaxis, :] + size * _CORNERS
+
+        left = np.floor(self.vertices.min(axis=1)).astype(np.int64)
+        right = np.ceil(self.vertices.max(axis=1)).astype(np.int64)
+        self.rects = np.concatenate([left, right - left + 1], axis=1)
+
+        for array in (self.centers, self.vertices, self.rects):
+            array.flags.writeable = False
+
+    def matches(self, size, origin):
+        return size == self.size and tuple(origin) == self.origin
+
+    def center(self, idx):
+        """(x, y) pixel centre of a cell index."""
+        x, y = self.centers[idx]
+        return float(x), float(y)
+
+    def polygon(self, idx):
+        """Corner points of a cell index, as a list of (x, y)."""
+        return [(float(x), float(y)) for x, y in self.vertices[idx]]
+
+
+@functools.lru_cache(maxsize=4)
+def hex_geometry(size, origin=(400, 300)):
+    """Shared geometry table of a layout (cached, so every user reads the same arrays)."""
+    return HexGeometry(size, origin)
@@ -0,0 +1,93 @@
+"""
+Pixel -> cell hit-testing
+
+A HitTestMap holds, for every pixel of the window, the index of the board
+cell under it (in src.core.cell_index order) or -1. It is computed once per
+layout with NumPy, using the same rounding as Board.pixel_to_hex, so a click
+or a mouse-motion event costs a single array read. Only the pixels inside the
+bounding box of the cell polygons (from the layout's HexGeometry) are
+rounded; the rest of the window is off the board.
+"""
+import numpy as np
+
+from src.core.cell_index import CELLS, CELL_INDEX
+from src.ui.geometry import hex_geometry
+
+NO_CELL = -1
+
+
+class HitTestMap:
+    """
+    Screen-sized lookup table of the cell under each pixel.
+    """
+    def __init__(self, screen_size, size, origin=(400, 300)):
+        """
+        Args:
+            screen_size: (width, height) of the window
+            size: Size of hexagons
+            origin: Pixel position of the center cell
+        """
+        self.screen_size = tuple(screen_size)
+        self.size = size
+        self.origin = tuple(origin)
+        self.cells = _build_map(self.screen_size, hex_geometry(size, self.origin))
+
+    def matches(self, screen_size, size, origin):
+        return tuple(screen_size) == self.screen_size and size == self.size and tuple(origin) == self.origin
+
+    def index_at(self, pos):
+        """Cell index under a screen position, or NO_CELL."""
+        x, y = int(pos[0]), int(pos[1])
+        width, height = self.screen_size
+        if not (0 <= x < width and 0 <= y < height):
+            return NO_CELL
+        return int(self.cells[y, x])
+
+    def cell_at(self, pos):
+        """Board cell under a screen position, or None outside the board."""
+        idx = self.index_at(pos)
+        return CELLS[idx] if idx != NO_CELL else None
+
+
+def _build_map(screen_size, geometry):
+    width, height = screen_size
+    cells = np.full((height, width), NO_CELL, dtype=np.int16)
+
+    # Window area covered by the board
+    rects = geometry.rects
+    left = max(0, int(rects[:, 0].min()))
+    top = max(0, int(rects[:, 1].min()))
+    right = min(width, int((rects[:, 0] + rects[:, 2]).max()))
+    bottom = min(height, int((rects[:, 1] + rects[:, 3]).max()))
+    if left >= right or top >= bottom:
+        return cells
+
+    size, origin = geometry.size, geometry.origin
+    x = np.arange(left, right, dtype=np.float64) - origin[0]
+    y = np.arange(top, bottom, dtype=np.float64) - origin[1]
+    x, y = np.meshgrid(x, y)
+
+    # Board.pixel_to_hex followed by Board.cube_round, on every pixel at once
+    q = (2 / 3 * x) / size
+    r = (-1 / 3 * x + np.sqrt(3) / 3 * y) / size
+    s = -q - r
+    rq, rr, rs = np.round(q), np.round(r), np.round(s)
+    q_diff, r_diff, s_diff = np.abs(rq - q), np.abs(rr - r), np.abs(rs - s)
+    fix_q = (q_diff > r_diff) & (q_diff > s_diff)
+    fix_r = ~fix_q & (r_diff > s_diff)
+    rq = np.where(fix_q, -rr - rs, rq)
+    rr = np.where(fix_r, -rq - rs, rr)
+
+    # Dense (q, r) -> cell index table covering the board
+    radius = max(max(abs(cell.q), abs(cell.r)) for cell in CELLS)
+    span = 2 * radius + 1
+    table = np.full((span, span), NO_CELL, dtype=np.int16)
+    for cell, idx in CELL_INDEX.items():
+        table[cell.q + radius, cell.r + radius] = idx
+
+    qi = rq.astype(np.int64) + radius
+    ri = rr.astype(np.int64) + radius
+    inside = (qi >= 0) & (qi < span) & (ri >= 0) & (ri < span)
+    area = cells[top:bottom, left:right]
+    area[inside] = table[qi[inside], ri[inside]]
+    return cells
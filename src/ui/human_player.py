@@ -3,11 +3,12 @@ Human Player class - Handles user inputs for game actions
 """
 import pygame
 from src.core.player import Player
-from src.core.hexagon import Hexagon
+from src.ui.layout import BoardLayout
 
 class HumanPlayer(Player):
     def __init__(self, color, name=None):
         super().__init__(color, name or f"Human ({color})")
+        self.layout = None
     
     def choose_action(self, board, game_state, screen):
         """
@@ -21,26 +22,25 @@ class HumanPlayer(Player):
         Returns:
             The selected action or None if no valid action was chosen
         """
-        waiting_for_action = True
-        action = None
-        size = 40  # Hexagon size
+        # Board geometry of the window, rebuilt only when its size changes
+        if self.layout is None:
+            self.layout = BoardLayout(screen.get_size())
+        else:
+            self.layout.resize(screen.get_size())
         
-        while waiting_for_action:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    return None  # Signal to exit game
-                
-                if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:  # Left click
-                    # Convert mouse position to hex coordinates
-                    x, y = event.pos
-                    q, r, s = board.pixel_to_hex(x - 400, y - 300, size)
-                    clicked_hex = Hexagon(q, r, s)
-                    
-                    # Check if the click is on a valid action
-                    if clicked_hex in game_state.possible_actions:
-                        action = clicked_hex
-                        waiting_for_action = False
+        while True:
+            # Block until the next event instead of polling
+            event = pygame.event.wait()
+            if event.type == pygame.QUIT:
+                return None  # Signal to exit game
             
-            pygame.time.Clock().tick(30)  # Cap at 30 FPS
-        
-        return action
\ No newline at end of file
+            if event.type == pygame.VIDEORESIZE:
+                self.layout.resize(event.size)
+            
+            if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:  # Left click
+                # Look up the cell under the mouse
+                clicked_hex = self.layout.cell_at(event.pos)
+                
+                # Check if the click is on a valid action
+                if clicked_hex in game_state.possible_actions:
+                    return clicked_hex
\ No newline at end of file
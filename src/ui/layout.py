@@ -0,0 +1,59 @@
+"""
+Board layout - hex size and origin derived from the window size
+
+The board was designed for an 800x600 window with 40-pixel hexagons centred
+at (400, 300). BoardLayout scales that reference to any window size and
+owns the cell geometry table and the pixel -> cell hit-test map of the
+layout. The renderer's static layer and sprites are keyed by the same size
+and origin, so all the cached geometry is rebuilt together, only when the
+window is resized.
+"""
+from src.ui.geometry import hex_geometry
+from src.ui.hit_test import HitTestMap
+
+# Window size and hex size the board was designed for
+REFERENCE_SCREEN_SIZE = (800, 600)
+REFERENCE_HEX_SIZE = 40
+
+# Smallest hex size that still leaves room for the piece glyphs
+MIN_HEX_SIZE = 12
+
+
+def fit_hex_size(screen_size):
+    """Hex size keeping the reference proportions in a window of screen_size."""
+    scale = min(screen_size[0] / REFERENCE_SCREEN_SIZE[0], screen_size[1] / REFERENCE_SCREEN_SIZE[1])
+    return max(MIN_HEX_SIZE, int(REFERENCE_HEX_SIZE * scale))
+
+
+class BoardLayout:
+    """
+    Geometry of the board view for one window size.
+    """
+    def __init__(self, screen_size=REFERENCE_SCREEN_SIZE):
+        self.screen_size = None
+        self.size = None
+        self.origin = None
+        self.geometry = None
+        self.hit_map = None
+        self.resize(screen_size)
+
+    def resize(self, screen_size):
+        """
+        Recompute the layout for a new window size.
+
+        Returns:
+            True if the geometry changed (and the caches were rebuilt)
+        """
+        screen_size = tuple(screen_size)
+        if screen_size == self.screen_size:
+            return False
+        self.screen_size = screen_size
+        self.size = fit_hex_size(screen_size)
+        self.origin = (screen_size[0] // 2, screen_size[1] // 2)
+        self.geometry = hex_geometry(self.size, self.origin)
+        self.hit_map = HitTestMap(screen_size, self.size, self.origin)
+        return True
+
+    def cell_at(self, pos):
+        """Board cell under a screen position, or None outside the board."""
+        return self.hit_map.cell_at(pos)
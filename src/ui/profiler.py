@@ -0,0 +1,129 @@
+"""
+Frame-time and input-latency profiler for the pygame client
+
+The controller times every frame, render_board call, possible_moves call and
+the delay between a click and the frame showing its result. The overlay,
+toggled with F3, shows a histogram of the recent frame times and the latest
+and average value of every metric. All samples can be exported to a CSV
+file for offline analysis.
+"""
+import collections
+import contextlib
+import csv
+import time
+
+import pygame
+
+from src.ui.rendering import draw_overlay, get_font
+
+TOGGLE_KEY = pygame.K_F3
+
+# Metrics recorded by the controller
+FRAME = "frame"
+RENDER_BOARD = "render_board"
+POSSIBLE_MOVES = "possible_moves"
+CLICK_LATENCY = "click_to_highlight"
+METRICS = (FRAME, RENDER_BOARD, POSSIBLE_MOVES, CLICK_LATENCY)
+
+# Number of recent samples shown by the overlay
+WINDOW = 120
+
+# Frame-time histogram bins, in milliseconds (last bin is open-ended)
+HISTOGRAM_BINS = (1, 2, 4, 8, 16, 33, 66)
+
+PANEL_SIZE = (300, 170)
+PANEL_COLOR = (0, 0, 0, 190)
+PANEL_TEXT_COLOR = (255, 255, 255)
+BAR_COLOR = (0, 200, 120)
+
+
+class Profiler:
+    """
+    Collects timing samples and draws them as an overlay.
+    """
+    def __init__(self):
+        self.visible = False
+        self.start_time = time.perf_counter()
+        self.samples = []  # (seconds since start, metric, milliseconds)
+        self.recent = {metric: collections.deque(maxlen=WINDOW) for metric in METRICS}
+        self._click_time = None
+
+    def toggle(self):
+        self.visible = not self.visible
+
+    def record(self, metric, ms):
+        self.samples.append((time.perf_counter() - self.start_time, metric, ms))
+        self.recent[metric].append(ms)
+
+    @contextlib.contextmanager
+    def measure(self, metric):
+        """Time the body of a with statement as one sample of metric."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(metric, (time.perf_counter() - start) * 1000)
+
+    def click(self):
+        """Mark the handling of a click; the next frame_drawn() closes the measurement."""
+        self._click_time = time.perf_counter()
+
+    def cancel_click(self):
+        self._click_time = None
+
+    def frame_drawn(self):
+        if self._click_time is not None:
+            self.record(CLICK_LATENCY, (time.perf_counter() - self._click_time) * 1000)
+            self._click_time = None
+
+    def histogram(self):
+        """Counts of the recent frame times per HISTOGRAM_BINS bin."""
+        counts = [0] * (len(HISTOGRAM_BINS) + 1)
+        for ms in self.recent[FRAME]:
+            i = 0
+            while i < len(HISTOGRAM_BINS) and ms >= HISTOGRAM_BINS[i]:
+                i += 1
+            counts[i] += 1
+        return counts
+
+    def draw(self, screen, position=None):
+        """Draw the overlay panel (bottom left by default)."""
+        if position is None:
+            position = (10, screen.get_height() - PANEL_SIZE[1] - 10)
+        panel = pygame.Surface(PANEL_SIZE, pygame.SRCALPHA)
+        panel.fill(PANEL_COLOR)
+        font = get_font(20)
+
+        # Latest / average of each metric
+        y = 6
+        for metric in METRICS:
+            values = self.recent[metric]
+            if values:
+                text = f"{metric:<18} {values[-1]:7.2f} ms  avg {sum(values) / len(values):7.2f}"
+            else:
+                text = f"{metric:<18}       -"
+            panel.blit(font.render(text, True, PANEL_TEXT_COLOR), (6, y))
+            y += 18
+
+        # Frame-time histogram
+        counts = self.histogram()
+        labels = [f"<{b}" for b in HISTOGRAM_BINS] + [f"{HISTOGRAM_BINS[-1]}+"]
+        bar_width = (PANEL_SIZE[0] - 12) // len(counts)
+        max_height = PANEL_SIZE[1] - y - 22
+        peak = max(counts) or 1
+        for i, (count, label) in enumerate(zip(counts, labels)):
+            x = 6 + i * bar_width
+            height = max_height * count // peak
+            pygame.draw.rect(panel, BAR_COLOR, (x + 2, y + 4 + max_height - height, bar_width - 4, height))
+            panel.blit(font.render(label, True, PANEL_TEXT_COLOR), (x + 2, PANEL_SIZE[1] - 18))
+
+        return draw_overlay(screen, panel, position)
+
+    def export_csv(self, path):
+        """Write every sample as time_s, metric, ms rows."""
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["time_s", "metric", "ms"])
+            for t, metric, ms in self.samples:
+                writer.writerow([f"{t:.6f}", metric, f"{ms:.4f}"])
+        return len(self.samples)
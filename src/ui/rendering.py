@@ -1,107 +1,332 @@
 """
 Rendering functions for the game board and pieces
+
+The static board (background, cells, borders, forbidden cells) is drawn once
+to an off-screen layer. Each render_board call only repaints the cells whose
+content changed since the previous frame, plus the areas covered by text and
+buttons drawn since then. The repainted rects and the overlays drawn over
+them are collected and pushed with a single pygame.display.update call by
+present(), so an overlay is never shown without its text for a frame.
 """
+import functools
+
 import pygame
-import math
-from src.core.piece import Unit, Double, Triple, Quadruple, Hat
 
-def render_board(screen, board, size, highlighted=None, blocked=None):
+from src.core.cell_index import CELL_INDEX
+from src.core.hexagon import Hexagon
+from src.core.piece import Hat
+from src.ui.geometry import hex_geometry
+
+BACKGROUND_COLOR = (255, 255, 255)
+CELL_COLOR = (200, 200, 200)  # Light gray by default
+FORBIDDEN_COLOR = (50, 50, 50)  # Dark gray for forbidden cells
+BLOCKED_COLOR = (100, 100, 100)  # Medium gray for blocked cells (during split)
+HIGHLIGHT_COLOR = (255, 255, 0)  # Yellow for highlighted cells
+HOVER_COLOR = (225, 225, 225)  # Cell under the mouse
+HOVER_HIGHLIGHT_COLOR = (255, 190, 0)  # Highlighted cell under the mouse
+BORDER_COLOR = (0, 0, 0)
+BUTTON_COLOR = (180, 180, 180)
+TEXT_COLOR = (0, 0, 0)
+
+CENTER = Hexagon(0, 0, 0)
+
+
+class BoardRenderer:
+    """
+    Off-screen static layer plus the state of the last frame drawn on a screen.
+    """
+    def __init__(self, screen, board, size, origin=(400, 300)):
+        self.screen = screen
+        self.size = size
+        self.origin = origin
+        self.screen_size = screen.get_size()
+
+        # Per-cell geometry, shared with the layout's hit-test map (see src.ui.geometry)
+        self.geometry = hex_geometry(size, origin)
+        self.cells = {hex_cell: CELL_INDEX[hex_cell] for hex_cell in board.complete_hex_board}
+        self.rects = {hex_cell: pygame.Rect(self.geometry.rects[idx].tolist()) for hex_cell, idx in self.cells.items()}
+
+        self.static_layer = pygame.Surface(self.screen_size)
+        self.static_layer.fill(BACKGROUND_COLOR)
+        for hex_cell, idx in self.cells.items():
+            color = FORBIDDEN_COLOR if hex_cell in board.forbidden_cells else CELL_COLOR
+            points = self.geometry.vertices[idx]
+            pygame.draw.polygon(self.static_layer, color, points, 0)
+            pygame.draw.polygon(self.static_layer, BORDER_COLOR, points, 1)
+
+        # Dirty areas are composed here, then copied to the screen
+        self.scratch = pygame.Surface(self.screen_size)
+
+        self.cell_keys = None  # Content of every cell in the last frame
+        self.overlay_rects = []  # Text and buttons drawn over the last frame
+
+    def matches(self, screen, size, origin):
+        return (screen is self.screen and size == self.size and origin == self.origin
+                and screen.get_size() == self.screen_size)
+
+    def render(self, board, highlighted, blocked, hover=None):
+        """Repaint what changed and return the dirty rects."""
+        keys = {
+            hex_cell: _cell_key(board, hex_cell, highlighted, blocked, hover)
+            for hex_cell in self.rects
+        }
+
+        if self.cell_keys is None:
+            # First frame: the whole screen
+            self.screen.blit(self.static_layer, (0, 0))
+            for hex_cell in self.rects:
+                self._draw_cell(self.screen, board, hex_cell, keys[hex_cell])
+            self.cell_keys = keys
+            self.overlay_rects = []
+            return [self.screen.get_rect()]
+
+        dirty = [self.rects[hex_cell] for hex_cell in keys if keys[hex_cell] != self.cell_keys[hex_cell]]
+        dirty.extend(self.overlay_rects)
+        self.cell_keys = keys
+        self.overlay_rects = []
+
+        for rect in dirty:
+            # Restore the static layer under the rect and redraw the cells it touches.
+            # Drawing unclipped off-screen keeps the pixels identical to a full redraw.
+            self.scratch.blit(self.static_layer, rect, rect)
+            for hex_cell in self._cells_in(rect):
+                self._draw_cell(self.scratch, board, hex_cell, keys[hex_cell])
+            self.screen.blit(self.scratch, rect, rect)
+        return dirty
+
+    def _cells_in(self, rect):
+        return [hex_cell for hex_cell, cell_rect in self.rects.items() if rect.colliderect(cell_rect)]
+
+    def _draw_cell(self, surface, board, hex_cell, key):
+        """Draw the dynamic content of one cell over the static layer."""
+        background, _content = key
+        idx = self.cells[hex_cell]
+        x, y = self.geometry.center(idx)
+        size = self.size
+
+        if background is not None:
+            points = self.geometry.vertices[idx]
+            pygame.draw.polygon(surface, background, points, 0)
+            pygame.draw.polygon(surface, BORDER_COLOR, points, 1)
+
+        # Pieces and hats are blitted from pre-rendered sprites
+        piece = board.pieces.get(hex_cell)
+        if piece is not None:
+            piece_type, color, hat_color = _sprite_key(piece)
+            _blit_sprite(surface, sprites.get(piece_type, color, hat_color, size), x, y)
+
+        # Special case for central position (0,0,0) with hats
+        if hex_cell == CENTER:
+            red_hat = bool(getattr(board, 'red_hat', None))
+            blue_hat = bool(getattr(board, 'blue_hat', None))
+            if red_hat or blue_hat:
+                sprite = sprites.get(CENTER_HATS, "red" if red_hat else None, "blue" if blue_hat else None, size)
+                _blit_sprite(surface, sprite, x, y)
+
+    def add_overlay(self, rect):
+        """Remember an area drawn over the board, restored on the next frame."""
+        self.overlay_rects.append(pygame.Rect(rect))
+
+
+class SpriteCache:
+    """
+    Pre-rendered piece glyphs keyed by (piece type, color, hat color, size).
+
+    Every glyph is drawn once on a transparent surface and blitted afterwards.
+    The cache is emptied when the hex size changes.
+    """
+    def __init__(self):
+        self.size = None
+        self._sprites = {}
+
+    def get(self, piece_type, color, hat_color, size):
+        if size != self.size:
+            self._sprites.clear()
+            self.size = size
+        key = (piece_type, color, hat_color, size)
+        sprite = self._sprites.get(key)
+        if sprite is None:
+            sprite = _render_sprite(piece_type, color, hat_color, size)
+            self._sprites[key] = sprite
+        return sprite
+
+
+# Sprite type of the hats still waiting in the centre cell
+CENTER_HATS = "CenterHats"
+
+STACK_LABELS = {"Double": "2", "Triple": "3", "Quadruple": "4"}
+
+sprites = SpriteCache()
+
+_renderer = None
+
+# Screen rects drawn since the last present()
+_pending_updates = []
+
+
+def _sprite_key(piece):
+    """(piece type, color, hat color) of the content of a cell."""
+    if isinstance(piece, tuple):
+        immobilized_piece, hat = piece
+        return type(immobilized_piece).__name__, immobilized_piece.color, hat.color
+    if isinstance(piece, Hat):
+        return "Hat", None, piece.color
+    return type(piece).__name__, piece.color, None
+
+
+def _render_sprite(piece_type, color, hat_color, size):
+    """Draw one glyph centred on a transparent (2 * size) square."""
+    sprite = pygame.Surface((2 * size, 2 * size), pygame.SRCALPHA)
+    x = y = size
+    if piece_type == CENTER_HATS:
+        # Draw red hat if present, then blue hat
+        if color:
+            draw_hat(sprite, x - size // 4, y, size, "red")
+        if hat_color:
+            draw_hat(sprite, x + size // 4, y, size, "blue")
+    elif piece_type == "Hat":
+        draw_hat(sprite, x, y, size, hat_color)
+    else:
+        draw_stack(sprite, x, y, size, piece_type, color)
+        if hat_color:
+            # Draw the hat on top with a slight offset
+            draw_hat(sprite, x, y - size // 6, size, hat_color)
+    return sprite
+
+
+def _blit_sprite(surface, sprite, x, y):
+    half = sprite.get_width() // 2
+    surface.blit(sprite, (int(x) - half, int(y) - half))
+
+
+def _cell_key(board, hex_cell, highlighted, blocked, hover=None):
+    """Everything that decides how a cell looks, to detect changes between frames."""
+    # Determine cell background color (None keeps the static layer)
+    if hex_cell in board.forbidden_cells:
+        background = None
+    elif hex_cell in blocked:
+        background = BLOCKED_COLOR
+    elif hex_cell == hover:
+        background = HOVER_HIGHLIGHT_COLOR if hex_cell in highlighted else HOVER_COLOR
+    elif hex_cell in highlighted:
+        background = HIGHLIGHT_COLOR
+    else:
+        background = None
+
+    piece = board.pieces.get(hex_cell)
+    content = _sprite_key(piece) if piece is not None else None
+    if hex_cell == CENTER:
+        content = (content, bool(getattr(board, 'red_hat', None)), bool(getattr(board, 'blue_hat', None)))
+    return background, content
+
+
+def get_renderer(screen, board, size, origin=(400, 300)):
+    """Renderer of a screen, rebuilt when the screen, hex size or origin changes."""
+    global _renderer
+    if _renderer is None or not _renderer.matches(screen, size, origin):
+        _renderer = BoardRenderer(screen, board, size, origin)
+    return _renderer
+
+
+def invalidate():
+    """Force the next render_board call to repaint the whole screen."""
+    if _renderer is not None:
+        _renderer.cell_keys = None
+
+
+def reset_caches():
+    """
+    Drop the fonts, sprites and renderer of the current pygame session.
+
+    Call it before pygame.quit(): a cached Font used after pygame is
+    initialised again crashes the interpreter.
+    """
+    global _renderer
+    get_font.cache_clear()
+    sprites._sprites.clear()
+    _renderer = None
+    _pending_updates.clear()
+
+
+def render_board(screen, board, size, highlighted=None, blocked=None, hover=None, origin=None):
     """
     Render the game board with pieces and highlights.
-    
+
     Args:
         screen: Pygame screen to render on
         board: Game board object
         size: Size of hexagons
         highlighted: Set of cells to highlight (yellow)
         blocked: Set of cells to display as blocked (dark gray)
+        hover: Cell under the mouse, if any
+        origin: Pixel position of the center cell (default: center of the screen)
+
+    Returns:
+        List of the screen rects that were repainted (pushed by the next present())
     """
-    # Clear the screen
-    screen.fill((255, 255, 255))
-    
-    # Use empty set if no blocked cells are specified
-    if blocked is None:
-        blocked = set()
-
-    # Draw each cell in the board
-    for hex_cell in board.complete_hex_board:
-        q, r, s = hex_cell.q, hex_cell.r, hex_cell.s
-        x = size * (3 / 2 * q) + 400  # Offset to center
-        y = size * (math.sqrt(3) * (r + q / 2)) + 300
-
-        # Determine cell background color
-        if hex_cell in board.forbidden_cells:
-            color = (50, 50, 50)  # Dark gray for forbidden cells
-        elif hex_cell in blocked:
-            color = (100, 100, 100)  # Medium gray for blocked cells (during split)
-        elif highlighted and hex_cell in highlighted:
-            color = (255, 255, 0)  # Yellow for highlighted cells
-        else:
-            color = (200, 200, 200)  # Light gray by default
-
-        # Draw the hexagon
-        points = [
-            (x + size * math.cos(math.radians(angle)), y + size * math.sin(math.radians(angle)))
-            for angle in range(0, 360, 60)
-        ]
-        pygame.draw.polygon(screen, color, points, 0)
-        pygame.draw.polygon(screen, (0, 0, 0), points, 1)  # Black border
-
-        # Check if there are pieces at this position
-        if hex_cell in board.pieces:
-            piece = board.pieces[hex_cell]
-            
-            # Handle tuple case (piece, hat)
-            if isinstance(piece, tuple):
-                immobilized_piece, hat = piece
-                
-                # Draw the immobilized piece
-                piece_color = (255, 0, 0) if immobilized_piece.color == "red" else (0, 0, 255)
-                pygame.draw.circle(screen, piece_color, (int(x), int(y)), size // 3)
-                
-                # Add numeric indicator for stacked pieces
-                if isinstance(immobilized_piece, Double):
-                    draw_number(screen, x, y, size, "2")
-                elif isinstance(immobilized_piece, Triple):
-                    draw_number(screen, x, y, size, "3")
-                elif isinstance(immobilized_piece, Quadruple):
-                    draw_number(screen, x, y, size, "4")
-                    
-                # Draw the hat on top with a slight offset
-                draw_hat(screen, x, y - size // 6, size, hat.color)
-            
-            # Draw regular piece
-            elif not isinstance(piece, Hat):
-                piece_color = (255, 0, 0) if piece.color == "red" else (0, 0, 255)
-                pygame.draw.circle(screen, piece_color, (int(x), int(y)), size // 3)
-                
-                # Add numeric indicator for stacked pieces
-                if isinstance(piece, Double):
-                    draw_number(screen, x, y, size, "2")
-                elif isinstance(piece, Triple):
-                    draw_number(screen, x, y, size, "3")
-                elif isinstance(piece, Quadruple):
-                    draw_number(screen, x, y, size, "4")
-            # Draw regular hat
-            elif isinstance(piece, Hat):
-                draw_hat(screen, x, y, size, piece.color)
-        
-        # Special case for central position (0,0,0) with hats
-        if hex_cell.q == 0 and hex_cell.r == 0 and hex_cell.s == 0:
-            # Draw red hat if present
-            if hasattr(board, 'red_hat') and board.red_hat:
-                draw_hat(screen, x - size // 4, y, size, "red")
-                
-            # Draw blue hat if present
-            if hasattr(board, 'blue_hat') and board.blue_hat:
-                draw_hat(screen, x + size // 4, y, size, "blue")
-
-    # Update the display
-    pygame.display.flip()
+    if origin is None:
+        origin = screen.get_rect().center
+    renderer = get_renderer(screen, board, size, origin)
+    dirty = renderer.render(board, set(highlighted or ()), set(blocked or ()), hover)
+    _pending_updates.extend(dirty)
+    return dirty
+
+
+def present():
+    """Push everything drawn since the last call to the display, in one update."""
+    if _pending_updates:
+        # Update only the parts of the display that changed
+        pygame.display.update(_pending_updates)
+        _pending_updates.clear()
+
+def draw_text(screen, text, position, font_size=30):
+    """Draw a line of text over the board (shown by the next present())."""
+    surface = get_font(font_size).render(text, True, TEXT_COLOR)
+    rect = screen.blit(surface, position)
+    _track_overlay(rect)
+    return rect
+
+def draw_button(screen, rect, label):
+    """Draw a labelled button over the board (shown by the next present())."""
+    rect = pygame.Rect(rect)
+    pygame.draw.rect(screen, BUTTON_COLOR, rect)
+    text = get_font(24).render(label, True, TEXT_COLOR)
+    screen.blit(text, (rect.x + 15, rect.y + 10))
+    _track_overlay(rect)
+    return rect
+
+def draw_overlay(screen, surface, position):
+    """Blit a pre-drawn panel over the board (shown by the next present())."""
+    rect = screen.blit(surface, position)
+    _track_overlay(rect)
+    return rect
+
+def _track_overlay(rect):
+    _pending_updates.append(pygame.Rect(rect))
+    if _renderer is not None:
+        _renderer.add_overlay(rect)
+
+@functools.lru_cache(maxsize=None)
+def get_font(size):
+    """Default font of a given size, loaded once."""
+    return pygame.font.Font(None, size)
+
+def draw_piece(screen, x, y, size, piece):
+    """Draw a piece disc, with its stack height for Double/Triple/Quadruple."""
+    draw_stack(screen, x, y, size, type(piece).__name__, piece.color)
+
+def draw_stack(screen, x, y, size, piece_type, color):
+    """Draw a piece disc given its type name and color."""
+    piece_color = (255, 0, 0) if color == "red" else (0, 0, 255)
+    pygame.draw.circle(screen, piece_color, (int(x), int(y)), size // 3)
+
+    # Add numeric indicator for stacked pieces
+    if piece_type in STACK_LABELS:
+        draw_number(screen, x, y, size, STACK_LABELS[piece_type])
 
 def draw_number(screen, x, y, size, number):
     """Draw a number in the center of a piece."""
-    font = pygame.font.Font(None, size)
+    font = get_font(size)
     text = font.render(number, True, (0, 0, 0))
     text_rect = text.get_rect(center=(int(x), int(y)))
     screen.blit(text, text_rect)
@@ -109,7 +334,7 @@ def draw_number(screen, x, y, size, number):
 def draw_hat(screen, x, y, size, color):
     """Draw a triangular hat."""
     triangle_offset = size // 3
-    
+
     if color == "red":
         triangle_points = [
             (x, y - triangle_offset),
@@ -117,7 +342,7 @@ def draw_hat(screen, x, y, size, color):
             (x + triangle_offset, y + triangle_offset/2),
         ]
         pygame.draw.polygon(screen, (255, 0, 0), triangle_points, 0)
-        
+
     elif color == "blue":
         triangle_points = [
             (x, y - triangle_offset),
@@ -125,6 +350,6 @@ def draw_hat(screen, x, y, size, color):
             (x + triangle_offset, y + triangle_offset/2),
         ]
         pygame.draw.polygon(screen, (0, 0, 255), triangle_points, 0)
-        
+
     # Add a black border
-    pygame.draw.polygon(screen, (0, 0, 0), triangle_points, 1)
\ No newline at end of file
+    pygame.draw.polygon(screen, (0, 0, 0), triangle_points, 1)
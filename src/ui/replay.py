@@ -0,0 +1,207 @@
+"""
+Input recording and deterministic replay of the interactive game flow
+
+Record a session (one JSON object per line: a header, the input events with
+their time since the start, and the final board):
+    python run_game.py --record session.jsonl
+
+Replay it at full speed under the SDL dummy video driver:
+    python -m src.ui.replay session.jsonl
+
+The replay feeds the recorded events to the same controller code, then
+reports the number of frames drawn, frame-time and render_board
+percentiles, and the final board. The final board is compared with the
+recorded one, so the replay fails on logic as well as on timing regressions.
+Only sessions between human players can be replayed: computer moves depend
+on the timing of the AI worker.
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import pygame
+
+# Input events stored in a recording, with the attributes kept for each
+RECORDED_EVENTS = {
+    pygame.MOUSEBUTTONDOWN: ("pos", "button"),
+    pygame.MOUSEBUTTONUP: ("pos", "button"),
+    pygame.MOUSEMOTION: ("pos",),
+    pygame.KEYDOWN: ("key",),
+    pygame.VIDEORESIZE: ("size",),
+    pygame.QUIT: (),
+}
+
+PERCENTILES = (50, 90, 99)
+
+
+class EventRecorder:
+    """
+    Collects the input events handled by the controllers of a session.
+    """
+    def __init__(self, screen_size, skip_placement=False):
+        self.header = {
+            "screen_size": list(screen_size),
+            "skip_placement": skip_placement,
+        }
+        self.start_time = time.perf_counter()
+        self.events = []
+
+    def record(self, event):
+        attributes = RECORDED_EVENTS.get(event.type)
+        if attributes is None:
+            return
+        entry = {"t": round(time.perf_counter() - self.start_time, 6), "type": pygame.event.event_name(event.type)}
+        for name in attributes:
+            value = getattr(event, name)
+            entry[name] = list(value) if isinstance(value, tuple) else value
+        self.events.append(entry)
+
+    def save(self, path, board):
+        """Write the header, the events and the final board."""
+        with open(path, "w") as f:
+            f.write(json.dumps(self.header) + "\n")
+            for entry in self.events:
+                f.write(json.dumps(entry) + "\n")
+            f.write(json.dumps({"final_board": describe_board(board), "digest": board_digest(board)}) + "\n")
+        return len(self.events)
+
+
+def load_recording(path):
+    """
+    Read a recording.
+
+    Returns:
+        (header, events, final) where final is the recorded final board entry (or None)
+    """
+    with open(path) as f:
+        lines = [json.loads(line) for line in f if line.strip()]
+    header, entries = lines[0], lines[1:]
+    final = None
+    if entries and "digest" in entries[-1]:
+        final = entries.pop()
+    return header, entries, final
+
+
+def recorded_events(entries):
+    """Yield the recorded events as pygame events, ignoring their timestamps."""
+    event_types = {pygame.event.event_name(event_type): event_type for event_type in RECORDED_EVENTS}
+    for entry in entries:
+        event_type = event_types[entry["type"]]
+        attributes = {
+            name: tuple(entry[name]) if isinstance(entry[name], list) else entry[name]
+            for name in RECORDED_EVENTS[event_type]
+        }
+        if event_type == pygame.VIDEORESIZE:
+            # Nothing resizes the dummy window: do what the window manager would
+            pygame.display.set_mode(attributes["size"], pygame.RESIZABLE)
+            attributes["w"], attributes["h"] = attributes["size"]
+        yield pygame.event.Event(event_type, **attributes)
+
+
+def describe_board(board):
+    """Canonical text description of the pieces and of the hats still in the center."""
+    entries = []
+    for hex_cell, piece in board.pieces.items():
+        if isinstance(piece, tuple):
+            immobilized_piece, hat = piece
+            text = f"{type(immobilized_piece).__name__}:{immobilized_piece.color}+Hat:{hat.color}"
+        else:
+            text = f"{type(piece).__name__}:{piece.color}"
+        entries.append(f"{hex_cell.q},{hex_cell.r},{hex_cell.s}={text}")
+    for color in ("red", "blue"):
+        if getattr(board, f"{color}_hat", None):
+            entries.append(f"center=Hat:{color}")
+    return sorted(entries)
+
+
+def board_digest(board):
+    return hashlib.sha1("\n".join(describe_board(board)).encode()).hexdigest()
+
+
+def replay(path):
+    """
+    Replay a recording at full speed under the dummy video driver.
+
+    Returns:
+        Report dict (frames, duration, percentiles, final board, digest match)
+    """
+    from src.core.board import Board
+    from src.core.player import Player
+    from src.game.game_phase import game_phase
+    from src.game.placement_phase import placement_phase
+    from src.game.rules import initialize_preset_configuration
+    from src.ui.profiler import FRAME, RENDER_BOARD, Profiler
+    from src.ui.rendering import reset_caches
+
+    header, entries, final = load_recording(path)
+
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    pygame.init()
+    try:
+        screen = pygame.display.set_mode(tuple(header["screen_size"]), pygame.RESIZABLE)
+        board = Board()
+        players = [Player(color="red", name="Player 1"), Player(color="blue", name="Player 2")]
+        profiler = Profiler()
+        events = recorded_events(entries)
+
+        start = time.perf_counter()
+        if header["skip_placement"]:
+            initialize_preset_configuration(board, players[0], players[1])
+            placement_complete = True
+        else:
+            placement_complete = placement_phase(screen, board, players, profiler=profiler, events=events)
+        if placement_complete:
+            game_phase(pygame.display.get_surface(), board, players, profiler=profiler, events=events)
+        duration = time.perf_counter() - start
+    finally:
+        reset_caches()
+        pygame.quit()
+
+    report = {
+        "events": len(entries),
+        "frames": sum(1 for _t, metric, _ms in profiler.samples if metric == FRAME),
+        "duration_s": duration,
+        "final_board": describe_board(board),
+        "digest": board_digest(board),
+        "expected_digest": final["digest"] if final else None,
+    }
+    for metric in (FRAME, RENDER_BOARD):
+        times = np.array([ms for _t, name, ms in profiler.samples if name == metric])
+        report[metric] = {f"p{p}": float(np.percentile(times, p)) if len(times) else 0.0 for p in PERCENTILES}
+        report[metric]["max"] = float(times.max()) if len(times) else 0.0
+    return report
+
+
+def main():
+    """Parse arguments, replay a recording and print the report."""
+    parser = argparse.ArgumentParser(description="Replay a recorded game session without a display")
+    parser.add_argument("recording", help="Recording written by run_game.py --record")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    report = replay(args.recording)
+    matches = report["expected_digest"] is None or report["digest"] == report["expected_digest"]
+
+    if args.json:
+        print(json.dumps(dict(report, matches=matches), indent=2))
+    else:
+        print(f"{report['events']} events, {report['frames']} frames in {report['duration_s']:.3f} s")
+        for metric in ("frame", "render_board"):
+            stats = "  ".join(f"{name} {value:.3f}" for name, value in report[metric].items())
+            print(f"{metric:<13} ms: {stats}")
+        print("Final board:")
+        for entry in report["final_board"]:
+            print(f"  {entry}")
+        if report["expected_digest"] is None:
+            print(f"Digest {report['digest']} (no recorded final board to compare)")
+        else:
+            print(f"Digest {report['digest']} {'matches' if matches else 'DIFFERS FROM'} the recording")
+    return 0 if matches else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
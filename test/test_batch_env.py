@@ -0,0 +1,37 @@
+"""
+Tests for the batched NumPy simulator against HexGameEnv
+"""
+import numpy as np
+
+from src.ai.batch_env import BatchedHexGame
+from src.ai.environment import HexGameEnv
+
+N_GAMES = 4
+N_STEPS = 150
+
+
+def test_random_rollouts_match_hex_game_env():
+    rng = np.random.default_rng(0)
+    envs = [HexGameEnv() for _ in range(N_GAMES)]
+    observations = [env.reset()[0] for env in envs]
+    batch = BatchedHexGame(N_GAMES, auto_reset=False)
+
+    for _ in range(N_STEPS):
+        np.testing.assert_array_equal(batch.observations(), np.stack(observations))
+        np.testing.assert_array_equal(batch.action_mask(), np.stack([env.action_mask() for env in envs]))
+
+        # Mostly legal moves, with some illegal ones to check they are rejected the same way
+        actions = np.array([
+            rng.choice(env.legal_actions()) if rng.random() < 0.8 else rng.integers(env.action_space.n)
+            for env in envs
+        ])
+        rewards, terminated, valid = batch.step(actions)
+        for i, env in enumerate(envs):
+            observations[i], reward, env_terminated, _truncated, info = env.step(int(actions[i]))
+            assert rewards[i] == np.float32(reward)
+            assert terminated[i] == env_terminated
+            assert valid[i] == info["valid_move"]
+            assert batch.current_player[i] == env.current_player_idx
+            if env_terminated:
+                observations[i] = env.reset()[0]
+                batch.reset([i])
@@ -0,0 +1,60 @@
+"""
+Tests for the board encoding shared by the environment and the AI players
+"""
+import numpy as np
+
+from src.ai.encoding import (
+    EMPTY_CHANNEL, FORBIDDEN_CHANNEL, PIECE_CHANNELS, encode_board, encode_cell, mover_observation
+)
+from src.core.board import Board
+from src.core.cell_index import CELL_INDEX
+from src.core.hexagon import Hexagon
+from src.core.piece import Hat, Quadruple, Unit
+
+CENTER = Hexagon(0, 0, 0)
+HATTED = Hexagon(1, 1, -2)
+LONE_HAT = Hexagon(-1, 2, -1)
+BLUE_QUADRUPLE = Hexagon(2, -1, -1)
+
+
+def board_with_hats():
+    """Board holding a hatted unit, a lone hat and a hat on the forbidden centre."""
+    board = Board()
+    board.pieces[HATTED] = (Unit("red", HATTED), Hat("blue", HATTED))
+    board.pieces[LONE_HAT] = Hat("red", LONE_HAT)
+    board.pieces[CENTER] = Hat("blue", CENTER)
+    board.pieces[BLUE_QUADRUPLE] = Quadruple("blue", BLUE_QUADRUPLE)
+    return board
+
+
+def test_board_with_hats_is_one_hot():
+    observation = encode_board(board_with_hats())
+
+    assert observation.shape[1] == 10
+    assert (observation.sum(axis=1) == 1).all()
+    channels = observation.argmax(axis=1)
+    assert channels[CELL_INDEX[HATTED]] == PIECE_CHANNELS[Unit, "red"]
+    assert channels[CELL_INDEX[LONE_HAT]] == EMPTY_CHANNEL
+    assert channels[CELL_INDEX[CENTER]] == FORBIDDEN_CHANNEL
+    assert channels[CELL_INDEX[BLUE_QUADRUPLE]] == PIECE_CHANNELS[Quadruple, "blue"]
+
+
+def test_encode_cell_matches_encode_board():
+    board = board_with_hats()
+    expected = encode_board(board)
+    observation = encode_board(Board())
+    for hex_cell in CELL_INDEX:
+        encode_cell(observation, board, hex_cell)
+    np.testing.assert_array_equal(observation, expected)
+
+
+def test_mover_observation_swaps_colours():
+    observation = encode_board(board_with_hats())
+    swapped = mover_observation(observation, 1).argmax(axis=1)
+
+    assert swapped[CELL_INDEX[HATTED]] == PIECE_CHANNELS[Unit, "blue"]
+    assert swapped[CELL_INDEX[BLUE_QUADRUPLE]] == PIECE_CHANNELS[Quadruple, "red"]
+    assert swapped[CELL_INDEX[LONE_HAT]] == EMPTY_CHANNEL
+    assert swapped[CELL_INDEX[CENTER]] == FORBIDDEN_CHANNEL
+    np.testing.assert_array_equal(mover_observation(mover_observation(observation, 1), 1), observation)
+    np.testing.assert_array_equal(mover_observation(observation, 0), observation)
@@ -0,0 +1,54 @@
+"""
+Tests for the pixel -> cell hit-test map
+"""
+import numpy as np
+
+from src.core.board import Board
+from src.core.cell_index import CELL_INDEX
+from src.core.hexagon import Hexagon
+from src.ui.hit_test import NO_CELL, HitTestMap
+from src.ui.layout import BoardLayout
+
+# (screen size, hex size, origin), including boards cut by the window edges
+LAYOUTS = [
+    ((800, 600), 40, (400, 300)),
+    ((1280, 720), 48, (640, 360)),
+    ((333, 222), 12, (166, 111)),
+    ((300, 200), 40, (150, 100)),
+    ((800, 600), 40, (-50, 700)),
+]
+
+
+def expected_index(board, x, y, size, origin):
+    """Cell index of a pixel through Board.pixel_to_hex."""
+    hex_cell = Hexagon(*board.pixel_to_hex(x - origin[0], y - origin[1], size))
+    return CELL_INDEX.get(hex_cell, NO_CELL)
+
+
+def test_hit_test_map_matches_pixel_to_hex():
+    board = Board()
+    rng = np.random.default_rng(0)
+    for screen_size, size, origin in LAYOUTS:
+        hit_map = HitTestMap(screen_size, size, origin)
+        xs = rng.integers(0, screen_size[0], size=5000)
+        ys = rng.integers(0, screen_size[1], size=5000)
+        for x, y in zip(xs.tolist(), ys.tolist()):
+            assert hit_map.index_at((x, y)) == expected_index(board, x, y, size, origin), (screen_size, x, y)
+
+
+def test_every_pixel_of_a_small_layout():
+    board = Board()
+    screen_size, size, origin = (200, 160), 16, (100, 80)
+    hit_map = HitTestMap(screen_size, size, origin)
+    expected = np.array([
+        [expected_index(board, x, y, size, origin) for x in range(screen_size[0])]
+        for y in range(screen_size[1])
+    ])
+    np.testing.assert_array_equal(hit_map.cells, expected)
+
+
+def test_off_screen_positions_and_layout_lookup():
+    layout = BoardLayout((800, 600))
+    assert layout.hit_map.index_at((-1, 10)) == NO_CELL
+    assert layout.hit_map.index_at((800, 10)) == NO_CELL
+    assert layout.cell_at(layout.origin) == Hexagon(0, 0, 0)
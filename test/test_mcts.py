@@ -0,0 +1,98 @@
+"""
+Tests for the array-backed MCTS tree and the batched search
+"""
+import numpy as np
+import pytest
+
+from src.ai.environment import HexGameEnv
+from src.ai.mcts import MCTS, MCTSTree, UniformEvaluator
+
+
+def test_backup_flips_the_sign_at_every_ply():
+    tree = MCTSTree()
+    tree.expand(0, np.array([10, 11]), np.array([0.5, 0.5]))
+    tree.expand(1, np.array([20]), np.array([1.0]))
+    path = [0, 1, 3]
+
+    tree.backup(path, 0.75)
+
+    # W[node] is seen by the player who moved into node; the leaf value is the mover's at the leaf
+    np.testing.assert_allclose(tree.W[path], [-0.75, 0.75, -0.75])
+    np.testing.assert_array_equal(tree.N[path], [1, 1, 1])
+    assert tree.N[2] == 0
+
+
+def test_virtual_loss_is_reverted_exactly():
+    tree = MCTSTree()
+    tree.expand(0, np.array([1, 2]), np.array([0.5, 0.5]))
+    tree.backup([0, 1], 1.0)
+    before = tree.N.copy(), tree.W.copy()
+
+    tree.apply_virtual_loss([0, 1], 3)
+    tree.revert_virtual_loss([0, 1], 3)
+
+    np.testing.assert_array_equal(tree.N, before[0])
+    np.testing.assert_array_equal(tree.W, before[1])
+
+
+def test_node_pool_grows_and_keeps_statistics():
+    tree = MCTSTree(initial_capacity=2, max_nodes=100)
+    assert tree.expand(0, np.arange(5), np.full(5, 0.2))
+    tree.backup([0, 3], 1.0)
+    assert tree.expand(3, np.arange(7), np.full(7, 1 / 7))
+
+    assert tree.size == 13
+    assert tree.capacity >= 13
+    np.testing.assert_array_equal(tree.action[1:6], np.arange(5))
+    assert tree.N[3] == 1 and tree.W[3] == -1.0
+    assert tree.first_child[3] == 6 and tree.child_count[3] == 7
+
+    tree.reset()
+    assert tree.size == 1 and not tree.is_expanded(0)
+
+
+def test_on_full_policies():
+    with pytest.raises(ValueError):
+        MCTSTree(on_full="grow")
+
+    tree = MCTSTree(initial_capacity=2, max_nodes=4, on_full="raise")
+    with pytest.raises(MemoryError):
+        tree.expand(0, np.arange(5), np.full(5, 0.2))
+
+    for policy in ("freeze", "stop"):
+        tree = MCTSTree(initial_capacity=2, max_nodes=4, on_full=policy)
+        assert not tree.expand(0, np.arange(5), np.full(5, 0.2))
+        assert tree.size == 1 and not tree.is_expanded(0)
+
+
+def run_search(on_full, max_nodes):
+    env = HexGameEnv()
+    mcts = MCTS(UniformEvaluator(env.action_space.n), n_simulations=64, batch_size=4,
+                max_nodes=max_nodes, on_full=on_full)
+    stats = []
+    pi = mcts.search(env, progress=stats.append)
+    return mcts, pi, stats[-1]
+
+
+def test_search_respects_the_node_pool_limit():
+    max_nodes = 2 * len(HexGameEnv().legal_actions())
+
+    mcts, pi, stats = run_search("freeze", max_nodes)
+    assert stats["simulations"] == 64
+    assert mcts.tree.size <= max_nodes
+    assert pi.sum() == pytest.approx(1.0)
+
+    mcts, pi, stats = run_search("stop", max_nodes)
+    assert stats["simulations"] < 64
+    assert mcts.tree.size <= max_nodes
+
+    with pytest.raises(MemoryError):
+        run_search("raise", max_nodes)
+
+
+def test_visit_distribution_covers_legal_actions_only():
+    env = HexGameEnv()
+    mcts = MCTS(UniformEvaluator(env.action_space.n), n_simulations=32, batch_size=4)
+    pi = mcts.search(env)
+    assert set(np.flatnonzero(pi)) <= set(env.legal_actions().tolist())
+    assert pi.sum() == pytest.approx(1.0)
@@ -0,0 +1,65 @@
+"""
+Tests for the board symmetry tables
+"""
+import numpy as np
+
+from src.ai.encoding import legal_actions
+from src.ai.environment import HexGameEnv
+from src.ai.symmetry import board_symmetries
+from src.core.board import Board
+from src.core.cell_index import CELL_INDEX, CELLS
+
+
+def transformed_board(board, symmetries, g):
+    """Copy of a board with every piece moved to the image of its cell under transform g."""
+    image = Board()
+    for hex_cell, piece in board.pieces.items():
+        target = CELLS[symmetries.cell_perm[g, CELL_INDEX[hex_cell]]]
+        image.pieces[target] = type(piece)(piece.color, target)
+    return image
+
+
+def random_positions(n_positions, n_moves, seed=0):
+    """Boards reached by random legal moves from the HexGameEnv start position."""
+    rng = np.random.default_rng(seed)
+    env = HexGameEnv()
+    positions = []
+    for _ in range(n_positions):
+        env.reset()
+        for _ in range(n_moves):
+            legal = env.legal_actions()
+            if len(legal) == 0:
+                break
+            _observation, _reward, terminated, _truncated, _info = env.step(int(rng.choice(legal)))
+            if terminated:
+                break
+        positions.append(env.board)
+    return positions
+
+
+def test_forbidden_cells_map_onto_forbidden_cells():
+    symmetries = board_symmetries()
+    forbidden = sorted(CELL_INDEX[cell] for cell in Board().forbidden_cells)
+    for g in range(len(symmetries)):
+        assert sorted(symmetries.cell_perm[g, forbidden]) == forbidden
+
+
+def test_transform_actions_matches_legal_moves_on_rotated_boards():
+    symmetries = board_symmetries()
+    for board in random_positions(n_positions=6, n_moves=12):
+        for color in ("red", "blue"):
+            legal = legal_actions(board, color)
+            for g in range(len(symmetries)):
+                expected = legal_actions(transformed_board(board, symmetries, g), color)
+                np.testing.assert_array_equal(np.sort(symmetries.transform_actions(legal, g)), expected)
+
+
+def test_transform_policies_agrees_with_transform_actions():
+    symmetries = board_symmetries()
+    rng = np.random.default_rng(1)
+    n_actions = symmetries.n_cells ** 2
+    policies = rng.random((2, n_actions)).astype(np.float32)
+    actions = rng.integers(0, n_actions, size=20)
+    for g in range(len(symmetries)):
+        transformed = symmetries.transform_policies(policies, g)
+        np.testing.assert_array_equal(transformed[:, symmetries.transform_actions(actions, g)], policies[:, actions])